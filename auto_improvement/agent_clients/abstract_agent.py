@@ -65,3 +65,13 @@ class AbstractAgentClient(ABC):
 
         """
         ...
+
+    def prepare(self) -> None:  # noqa: B027
+        """
+        Do any interactive one-time setup, such as authentication, before a run starts.
+
+        Called before progress output takes over the terminal, so prompts stay readable.
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release resources held by the client, such as sandbox containers."""
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import atexit
+import collections
+import contextlib
+import hashlib
+import io
 import json
 import os
 import shutil
 import subprocess
+import sys
+import tarfile
+import threading
 import typing
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from auto_improvement.agent_clients.abstract_agent import AbstractAgentClient
@@ -21,13 +31,22 @@ DOCKER_BUILD_TIMEOUT = 600  # 10 minutes
 DOCKER_AUTH_TIMEOUT = 300  # 5 minutes
 SDK_RUN_TIMEOUT = 3000  # 50 minutes
 GIT_STATUS_TIMEOUT = 5
+DOCKER_CONTAINER_TIMEOUT = 30
+
+# Exit code of docker run when the container could not be started, e.g. its image is missing
+DOCKER_RUN_FAILED = 125
+
+# Threads used to read the files changed by the agent
+FILE_READ_WORKERS = 8
+
+# Lines of docker build output kept for the error message
+BUILD_LOG_TAIL_LINES = 200
 
 
 # SDK runner script that will be embedded in the Docker image
 SDK_RUNNER_SCRIPT = '''#!/usr/bin/env python3
 """SDK runner script for executing Claude Agent SDK inside Docker."""
 
-import argparse
 import asyncio
 import json
 import os
@@ -45,7 +64,7 @@ async def run_query(
     disallowed_tools: list[str] | None = None,
     print_output: bool = True,
     cwd: str = "/workspace",
-) -> str:
+) -> None:
     """Run a query using the Claude Agent SDK."""
     options = ClaudeAgentOptions(
         system_prompt=system_prompt,
@@ -58,28 +77,17 @@ async def run_query(
     if model:
         options.model = model
 
-    output_parts = []
-
     async for message in query(prompt=prompt, options=options):
-        if isinstance(message, AssistantMessage):
+        if print_output and isinstance(message, AssistantMessage):
             for block in message.content:
                 if isinstance(block, TextBlock):
-                    if print_output:
-                        print(block.text)
-                    output_parts.append(block.text)
-
-    return "\\n".join(output_parts)
+                    print(block.text)
 
 
 def main() -> None:
     """Main entry point for the SDK runner."""
-    parser = argparse.ArgumentParser(description="Run Claude Agent SDK")
-    parser.add_argument("--config", required=True, help="JSON config file path")
-    args = parser.parse_args()
-
-    # Read config from file
-    with open(args.config) as f:
-        config = json.load(f)
+    # Read config from stdin
+    config = json.load(sys.stdin)
 
     prompt = config.get("prompt", "")
     system_prompt = config.get("system_prompt")
@@ -109,64 +117,13 @@ if __name__ == "__main__":
 '''
 
 
-class ClaudeClient(AbstractAgentClient):
-    """Client for interacting with Claude using the Agent SDK inside Docker."""
-
-    def __init__(self, config: AgentConfig, working_dir: Path | None = None):
-        self.config = config
-        self.working_dir = working_dir or Path.cwd()
-        self.agent_file = "CLAUDE.md"
-        self.agent_name = "Claude"
-        self.code_path = "claude"
-
-        self._ensure_docker_image()
-        self._ensure_docker_auth()
-
-    def _ensure_docker_image(self) -> None:
-        """Ensure the Docker sandbox image exists, build if needed."""
-        # Check if image exists
-        result = subprocess.run(
-            ["docker", "images", "-q", self.config.docker_image],
-            capture_output=True,
-            text=True,
-            timeout=DOCKER_IMAGE_CHECK_TIMEOUT,
-            check=False,
-        )
-
-        if result.stdout.strip():
-            return  # Image exists
-
-        # Image doesn't exist, build it
-        print(f"Building Docker sandbox image '{self.config.docker_image}'...")
-
-        # Get Dockerfile from package resources
-        dockerfile_content = self._get_dockerfile_content()
-
-        # Build image using stdin
-        result = subprocess.run(
-            ["docker", "build", "-t", self.config.docker_image, "-"],
-            input=dockerfile_content,
-            capture_output=True,
-            text=True,
-            timeout=DOCKER_BUILD_TIMEOUT,
-            check=False,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(
-                f"Failed to build Docker image: {result.stderr}\n"
-                "You can manually build: docker build -t auto-improve-sandbox ."
-            )
-
-        print(f"Docker image '{self.config.docker_image}' built successfully.")
-
-    def _get_dockerfile_content(self) -> str:
-        """Get Dockerfile content with Python, uv, and Claude Agent SDK."""
-        return f"""# Docker image for running Claude Agent SDK in isolation
+# Dockerfile for the sandbox image, built with the SDK runner script in its context
+DOCKERFILE_CONTENT = """# Docker image for running Claude Agent SDK in isolation
 FROM python:3.12-slim
 
 # Install system dependencies
-RUN apt-get update && apt-get install -y \\
+RUN apt-get update && apt-get install -y --no-install-recommends \\
+    ca-certificates \\
     git \\
     make \\
     curl \\
@@ -174,15 +131,15 @@ RUN apt-get update && apt-get install -y \\
     npm \\
     && rm -rf /var/lib/apt/lists/*
 
-# Install Claude Code CLI
-RUN npm install -g @anthropic-ai/claude-code
+# Install Claude Code CLI (the Agent SDK drives it as a subprocess)
+RUN npm install -g @anthropic-ai/claude-code && npm cache clean --force
 
 # Install uv for fast Python package management
 RUN curl -LsSf https://astral.sh/uv/install.sh | sh
 ENV PATH="/root/.local/bin:$PATH"
 
 # Install claude-agent-sdk as root (before creating non-root user)
-RUN uv pip install --system claude-agent-sdk anyio
+RUN uv pip install --system --no-cache claude-agent-sdk anyio
 
 # Create non-root user
 RUN useradd -m -s /bin/bash claude && \\
@@ -195,12 +152,8 @@ ENV PATH="/home/claude/.local/bin:$PATH"
 
 WORKDIR /app
 
-# Create the SDK runner script
-COPY --chown=claude:claude <<'RUNNER_EOF' /app/sdk_runner.py
-{SDK_RUNNER_SCRIPT}
-RUNNER_EOF
-
-RUN chmod +x /app/sdk_runner.py
+# Copy the SDK runner script last, so editing it only rebuilds this layer
+COPY --chown=claude:claude sdk_runner.py /app/sdk_runner.py
 
 # Set workspace as default working directory
 WORKDIR /workspace
@@ -209,11 +162,204 @@ WORKDIR /workspace
 ENTRYPOINT ["python", "/app/sdk_runner.py"]
 """
 
+# Fingerprint of the image definition, recorded after a build to detect stale images
+DOCKERFILE_DIGEST = hashlib.sha256(
+    f"{DOCKERFILE_CONTENT}\0{SDK_RUNNER_SCRIPT}".encode()
+).hexdigest()
+
+# Image label carrying DOCKERFILE_DIGEST, so unrecorded images can be told apart from
+# images built from an older definition or by hand
+DOCKERFILE_DIGEST_LABEL = "auto-improve.dockerfile-digest"
+
+
+class ClaudeClient(AbstractAgentClient):
+    """Client for interacting with Claude using the Agent SDK inside Docker."""
+
+    # Docker setups already verified in this process, keyed by (docker_image, code_path)
+    _ready_setups: typing.ClassVar[set[tuple[str, str]]] = set()
+    # Clients working on PRs in parallel must not build the image concurrently
+    _ready_lock: typing.ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, config: AgentConfig, working_dir: Path | None = None):
+        self.config = config
+        self.working_dir = working_dir or Path.cwd()
+        self.agent_file = "CLAUDE.md"
+        self.agent_name = "Claude"
+        self.code_path = "claude"
+        self._claude_config_dir: Path | None = None
+        # Long-lived sandbox containers, keyed by the workspace they mount
+        self._containers: dict[Path, str] = {}
+
+    def _ensure_ready(self) -> None:
+        """Ensure the Docker image and authentication are in place before the first run."""
+        key = (self.config.docker_image, self.config.code_path)
+        if key in ClaudeClient._ready_setups:
+            return
+
+        with ClaudeClient._ready_lock:
+            if key in ClaudeClient._ready_setups:
+                return  # Set up by another thread meanwhile
+
+            self._ensure_docker_image()
+            self._ensure_docker_auth()
+            ClaudeClient._ready_setups.add(key)
+
+    def _ensure_docker_image(self) -> None:
+        """Ensure the Docker sandbox image exists, build if needed."""
+        recorded_digest = self._load_image_state().get(self.config.docker_image)
+        if recorded_digest == DOCKERFILE_DIGEST:
+            return  # Built from the current Dockerfile
+
+        if recorded_digest is None:
+            # No build recorded here, adopt the image only if its label shows it is current
+            result = subprocess.run(
+                [
+                    "docker",
+                    "image",
+                    "inspect",
+                    "--format",
+                    f'{{{{ index .Config.Labels "{DOCKERFILE_DIGEST_LABEL}" }}}}',
+                    self.config.docker_image,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=DOCKER_IMAGE_CHECK_TIMEOUT,
+                check=False,
+            )
+
+            if result.returncode == 0 and result.stdout.strip() == DOCKERFILE_DIGEST:
+                self._save_image_state(DOCKERFILE_DIGEST)
+                return  # Image exists and is current
+
+            if result.returncode == 0:
+                print(f"Rebuilding outdated Docker sandbox image '{self.config.docker_image}'...")
+            else:
+                print(f"Building Docker sandbox image '{self.config.docker_image}'...")
+        else:
+            print(f"Rebuilding outdated Docker sandbox image '{self.config.docker_image}'...")
+
+        build_context = self._build_docker_context()
+
+        if "/" in self.config.docker_image:
+            # Seed the layer cache from the registry copy of the image, if there is one
+            subprocess.run(
+                ["docker", "pull", self.config.docker_image],
+                capture_output=True,
+                timeout=DOCKER_BUILD_TIMEOUT,
+                check=False,
+            )
+
+        # Build image from the tar context on stdin, reusing layers of any previous build
+        with subprocess.Popen(
+            [
+                "docker",
+                "build",
+                "--cache-from",
+                self.config.docker_image,
+                "--build-arg",
+                "BUILDKIT_INLINE_CACHE=1",
+                "--label",
+                f"{DOCKERFILE_DIGEST_LABEL}={DOCKERFILE_DIGEST}",
+                "-t",
+                self.config.docker_image,
+                "-",
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,  # Only stderr is reported on failure
+            stderr=subprocess.PIPE,
+            env={**os.environ, "DOCKER_BUILDKIT": "1"},
+        ) as proc:
+            timer = threading.Timer(DOCKER_BUILD_TIMEOUT, proc.kill)
+            timer.start()
+            try:
+                stdin = typing.cast("typing.IO[bytes]", proc.stdin)
+                stdin.write(build_context)
+                stdin.close()
+                # Drain the build log as it streams, keeping only its end for errors
+                log_tail = collections.deque(
+                    typing.cast("typing.IO[bytes]", proc.stderr), maxlen=BUILD_LOG_TAIL_LINES
+                )
+                returncode = proc.wait()
+            finally:
+                timer.cancel()
+
+        if returncode != 0:
+            build_log = b"".join(log_tail).decode(errors="replace")
+            raise RuntimeError(
+                f"Failed to build Docker image: {build_log}\n"
+                "Check that Docker is running and can reach the network, then retry. "
+                "The image is built from a generated context, not the repository Dockerfile."
+            )
+
+        self._save_image_state(DOCKERFILE_DIGEST)
+        print(f"Docker image '{self.config.docker_image}' built successfully.")
+
+    def _rebuild_if_image_missing(self) -> bool:
+        """Rebuild the image if it was removed since it was recorded, e.g. by docker rmi."""
+        result = subprocess.run(
+            ["docker", "image", "inspect", self.config.docker_image],
+            capture_output=True,
+            timeout=DOCKER_IMAGE_CHECK_TIMEOUT,
+            check=False,
+        )
+        if result.returncode == 0:
+            return False  # The run failed for another reason
+
+        with ClaudeClient._ready_lock:
+            state = self._load_image_state()
+            if state.pop(self.config.docker_image, None) is not None:
+                self._get_image_state_file().write_text(json.dumps(state, indent=2))
+            ClaudeClient._ready_setups.discard((self.config.docker_image, self.config.code_path))
+
+        self._ensure_ready()
+        return True
+
+    def _get_dockerfile_content(self) -> str:
+        """Get Dockerfile content with Python, uv, and Claude Agent SDK."""
+        return DOCKERFILE_CONTENT
+
+    def _build_docker_context(self) -> bytes:
+        """Build an in-memory tar build context with the Dockerfile and SDK runner script."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            for name, content, mode in (
+                ("Dockerfile", self._get_dockerfile_content(), 0o644),
+                ("sdk_runner.py", SDK_RUNNER_SCRIPT, 0o755),
+            ):
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mode = mode
+                tar.addfile(info, io.BytesIO(data))
+        return buffer.getvalue()
+
+    def _get_image_state_file(self) -> Path:
+        """Get the file recording the Dockerfile digest each image was built from."""
+        return Path.home() / ".auto-improve" / "image-state.json"
+
+    def _load_image_state(self) -> dict[str, str]:
+        """Load the recorded Dockerfile digests, keyed by image name."""
+        try:
+            state = json.loads(self._get_image_state_file().read_text())
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save_image_state(self, digest: str) -> None:
+        """Record the Dockerfile digest the configured image was built from."""
+        state = self._load_image_state()
+        state[self.config.docker_image] = digest
+        state_file = self._get_image_state_file()
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        state_file.write_text(json.dumps(state, indent=2))
+
     def _get_claude_config_dir(self) -> Path:
         """Get the persistent Claude config directory for Docker."""
-        config_dir = Path.home() / ".auto-improve" / "claude-config"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        return config_dir
+        if self._claude_config_dir is None:
+            config_dir = Path.home() / ".auto-improve" / "claude-config"
+            config_dir.mkdir(parents=True, exist_ok=True)
+            self._claude_config_dir = config_dir
+        return self._claude_config_dir
 
     def _ensure_docker_auth(self) -> None:
         """Ensure Claude is authenticated in Docker, run setup-token if needed."""
@@ -226,29 +372,14 @@ ENTRYPOINT ["python", "/app/sdk_runner.py"]
         print("Claude Code authentication required in Docker container.")
         print("Running 'claude setup-token' - please follow the prompts...")
 
-        # Run setup-token interactively
-        result = subprocess.run(
-            [
-                "docker",
-                "run",
-                "-it",
-                "--rm",
-                "-v",
-                f"{claude_config}:/home/claude/.claude",
-                self.config.docker_image,
-                "--help",  # Override entrypoint temporarily
-            ],
-            timeout=DOCKER_IMAGE_CHECK_TIMEOUT,
-            check=False,
-        )
-
-        # Now run the actual setup-token with claude CLI
+        # Run setup-token interactively with claude CLI
         result = subprocess.run(
             [
                 "docker",
                 "run",
                 "-it",
                 "--rm",
+                "--pull=never",
                 "--entrypoint",
                 "claude",
                 "-v",
@@ -270,31 +401,101 @@ ENTRYPOINT ["python", "/app/sdk_runner.py"]
 
         print("Claude Code authenticated successfully.")
 
-    def _build_docker_cmd(
-        self,
-        config_file: Path,
-        workspace_dir: Path,
-    ) -> list[str]:
-        """Build Docker command to run the SDK runner in isolation."""
+    def _build_docker_run_options(self, workspace_dir: Path) -> list[str]:
+        """Build the mount, environment and hardening options for a sandbox container."""
         claude_config = self._get_claude_config_dir()
+        network = [f"--network={self.config.docker_network}"] if self.config.docker_network else []
         return [
-            "docker",
-            "run",
-            "--rm",
+            # The runner needs no Linux capabilities, only outbound HTTPS to the API
+            "--cap-drop=ALL",
+            "--security-opt=no-new-privileges",
+            *network,
             "-v",
             f"{workspace_dir}:/workspace",
             "-v",
             f"{claude_config}:/home/claude/.claude",  # Persistent auth
-            "-v",
-            f"{config_file}:/app/config.json:ro",  # Mount config file
             "-w",
             "/workspace",
             "-e",
             f"ANTHROPIC_API_KEY={os.environ.get('ANTHROPIC_API_KEY', '')}",
+        ]
+
+    def _build_docker_cmd(self, workspace_dir: Path) -> list[str]:
+        """Build Docker command to run the SDK runner in isolation."""
+        if self.config.reuse_container:
+            container = self._get_container(workspace_dir)
+            # SDK config is passed on stdin
+            return ["docker", "exec", "-i", container, "python", "/app/sdk_runner.py"]
+
+        return [
+            "docker",
+            "run",
+            "--rm",
+            "-i",  # SDK config is passed on stdin
+            "--pull=never",  # Image is built or verified by _ensure_docker_image
+            *self._build_docker_run_options(workspace_dir),
+            self.config.docker_image,
+        ]
+
+    def _get_container(self, workspace_dir: Path) -> str:
+        """Get the long-lived sandbox container for a workspace, starting it if needed."""
+        workspace_dir = workspace_dir.resolve()
+        if workspace_dir in self._containers:
+            return self._containers[workspace_dir]
+
+        container = f"auto-improve-{uuid.uuid4().hex[:12]}"
+        cmd = [
+            "docker",
+            "run",
+            "-d",
+            "--rm",
+            "--pull=never",  # Image is built or verified by _ensure_docker_image
+            "--name",
+            container,
+            *self._build_docker_run_options(workspace_dir),
+            "--entrypoint",
+            "sleep",
             self.config.docker_image,
-            "--config",
-            "/app/config.json",
+            "infinity",
         ]
+        result = subprocess.run(
+            cmd, capture_output=True, text=True, timeout=DOCKER_CONTAINER_TIMEOUT, check=False
+        )
+        if result.returncode != 0 and self._rebuild_if_image_missing():
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=DOCKER_CONTAINER_TIMEOUT, check=False
+            )
+
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to start Docker sandbox container: {result.stderr}")
+
+        if not self._containers:
+            atexit.register(self._stop_containers)
+        self._containers[workspace_dir] = container
+        return container
+
+    @typing.override
+    def prepare(self) -> None:
+        """Build the sandbox image and authenticate, which may prompt for a token."""
+        if self.config.use_docker:
+            self._ensure_ready()
+
+    @typing.override
+    def close(self) -> None:
+        """Remove the sandbox containers started by this client."""
+        self._stop_containers()
+
+    def _stop_containers(self) -> None:
+        """Remove the long-lived sandbox containers started by this client."""
+        for container in self._containers.values():
+            with contextlib.suppress(OSError, subprocess.TimeoutExpired):
+                subprocess.run(
+                    ["docker", "rm", "-f", container],
+                    capture_output=True,
+                    timeout=DOCKER_CONTAINER_TIMEOUT,
+                    check=False,
+                )
+        self._containers.clear()
 
     def _build_implementation_prompt(
         self,
@@ -326,9 +527,8 @@ ENTRYPOINT ["python", "/app/sdk_runner.py"]
         """Detect files that have been changed in the working directory."""
         try:
             result = subprocess.run(
-                ["git", "status", "--porcelain"],
+                ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all"],
                 capture_output=True,
-                text=True,
                 cwd=str(self.working_dir),
                 timeout=GIT_STATUS_TIMEOUT,
                 check=False,
@@ -336,12 +536,15 @@ ENTRYPOINT ["python", "/app/sdk_runner.py"]
 
             if result.returncode == 0:
                 changed_files = []
-                for line in result.stdout.split("\n"):
-                    if line.strip():
-                        # Parse git status format: "XY filename"
-                        parts = line.strip().split(maxsplit=1)
-                        if len(parts) == 2:
-                            changed_files.append(parts[1])
+                records = iter(result.stdout.split(b"\x00"))
+                for record in records:
+                    if not record:
+                        continue
+                    # Each record is "XY filename", unquoted thanks to -z
+                    changed_files.append(os.fsdecode(record[3:]))
+                    # Renames and copies carry the original path as an extra record
+                    if record[:1] in (b"R", b"C"):
+                        next(records, None)
                 return changed_files
         except Exception:
             pass
@@ -354,8 +557,8 @@ ENTRYPOINT ["python", "/app/sdk_runner.py"]
         workspace_dir: Path,
         system_prompt: str | None = None,
         disallowed_tools: list[str] | None = None,
-    ) -> subprocess.CompletedProcess[str]:
-        """Run the SDK inside Docker with the given configuration."""
+    ) -> subprocess.CompletedProcess[bytes]:
+        """Run the SDK inside Docker (or on the host, if disabled) with the given configuration."""
         # Build SDK config
         sdk_config = {
             "prompt": prompt,
@@ -366,24 +569,34 @@ ENTRYPOINT ["python", "/app/sdk_runner.py"]
             "cwd": "/workspace",
         }
 
-        # Write config to temp file in workspace (accessible in Docker)
-        config_file = workspace_dir / ".sdk-config.json"
-        config_file.write_text(json.dumps(sdk_config, indent=2))
+        if self.config.use_docker:
+            self._ensure_ready()
+            cmd = self._build_docker_cmd(workspace_dir)
+        else:
+            # Same runner script, executed by the host interpreter in the workspace itself
+            sdk_config["cwd"] = str(workspace_dir)
+            cmd = [sys.executable, "-c", SDK_RUNNER_SCRIPT]
 
-        try:
-            cmd = self._build_docker_cmd(config_file, workspace_dir)
+        # Pass config on stdin so nothing is written to (or mounted from) the workspace
+        sdk_input = json.dumps(sdk_config, separators=(",", ":")).encode("utf-8")
+        result = subprocess.run(
+            cmd, input=sdk_input, cwd=workspace_dir, timeout=SDK_RUN_TIMEOUT, check=False
+        )
 
+        # The recorded image may have been removed since; rebuild it and run once more
+        if (
+            self.config.use_docker
+            and result.returncode == DOCKER_RUN_FAILED
+            and self._rebuild_if_image_missing()
+        ):
             result = subprocess.run(
-                cmd,
-                text=True,
+                self._build_docker_cmd(workspace_dir),
+                input=sdk_input,
+                cwd=workspace_dir,
                 timeout=SDK_RUN_TIMEOUT,
                 check=False,
             )
-
-            return result
-        finally:
-            # Clean up config file
-            config_file.unlink(missing_ok=True)
+        return result
 
     @typing.override
     def generate_solution(
@@ -407,11 +620,16 @@ CRITICAL RULES:
 
 Implement the solution by editing the necessary files directly."""
 
-        # Copy agent MD file to workspace so Claude auto-reads it
+        # Link agent MD file into the workspace so Claude auto-reads it
         workspace_agent_md = None
         if agent_md_path and agent_md_path.exists():
             workspace_agent_md = self.working_dir / self.agent_file
-            shutil.copy(agent_md_path, workspace_agent_md)
+            workspace_agent_md.unlink(missing_ok=True)
+            try:
+                # A hard link (unlike a symlink) also resolves inside the container
+                workspace_agent_md.hardlink_to(agent_md_path)
+            except OSError:
+                shutil.copy(agent_md_path, workspace_agent_md)  # e.g. across filesystems
 
         try:
             # Run SDK in Docker with disallowed git history tools
@@ -422,9 +640,13 @@ Implement the solution by editing the necessary files directly."""
                 disallowed_tools=["Bash(git log:*)", "Bash(git show:*)"],
             )
         finally:
-            # Move agent MD back to learning dir (in case it was modified)
             if workspace_agent_md and workspace_agent_md.exists() and agent_md_path:
-                shutil.move(workspace_agent_md, agent_md_path)
+                if agent_md_path.exists() and workspace_agent_md.samefile(agent_md_path):
+                    # Still linked, any edits already landed in the learning dir
+                    workspace_agent_md.unlink()
+                else:
+                    # Copied or replaced by the agent, move it back to learning dir
+                    shutil.move(workspace_agent_md, agent_md_path)
 
         if result.returncode != 0:
             raise RuntimeError(f"Claude SDK failed with return code {result.returncode}")
@@ -432,17 +654,28 @@ Implement the solution by editing the necessary files directly."""
         # Detect files that Claude modified in the working directory
         changed_files = self._detect_changed_files()
 
-        files = {}
-        for file_path in changed_files:
-            full_path = self.working_dir / file_path
-            if full_path.exists():
-                files[file_path] = full_path.read_text()
+        # Read the changed files concurrently, the GIL is released during file I/O
+        with ThreadPoolExecutor(max_workers=FILE_READ_WORKERS) as executor:
+            contents = executor.map(self._read_changed_file, changed_files)
+            files = {
+                file_path: content
+                for file_path, content in zip(changed_files, contents, strict=True)
+                if content is not None
+            }
 
         return Solution(
             files=files,
             description=f"Solution generated by Claude SDK for PR #{pr_info.number}",
         )
 
+    def _read_changed_file(self, file_path: str) -> str | None:
+        """Read a changed file, or return None if it is no longer a file."""
+        try:
+            data = (self.working_dir / file_path).read_bytes()
+        except (FileNotFoundError, IsADirectoryError):
+            return None  # Deleted by the agent, or a submodule directory
+        return data.decode("utf-8", errors="replace")
+
     @typing.override
     def run_analysis(self, prompt: str, workspace_dir: Path) -> None:
         """Run analysis with Claude SDK in Docker for isolation."""
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import io
+import os
+import string
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -9,6 +12,28 @@ if TYPE_CHECKING:
     from auto_improvement.agent_clients.abstract_agent import AbstractAgentClient
     from auto_improvement.models import PRInfo, Solution
 
+# Characters of each SKILL.md shown in the skills summary
+SKILL_PREVIEW_CHARS = 500
+# Upper bound on the size of the whole skills summary embedded in the prompt
+SKILLS_SUMMARY_BUDGET = 32 * 1024
+
+# Placeholders available to (custom) analysis prompts
+ANALYSIS_PROMPT_FIELDS = frozenset(
+    {
+        "pr_number",
+        "pr_title",
+        "pr_description",
+        "issue_description",
+        "developer_solution",
+        "agent_solution",
+        "current_agent_md",
+        "current_skills",
+        "current_mcp",
+        "agent_name",
+        "agent_file",
+    }
+)
+
 
 class UnifiedAnalyzer:
     """
@@ -40,19 +65,46 @@ class UnifiedAnalyzer:
 
         """
         self.agent_client = agent_client
+        # Created on first write, by _initialize_files
         self.learning_dir = local_path
-        self.learning_dir.mkdir(parents=True, exist_ok=True)
 
         # Initialize learning files - use agent_file from client
         self.agent_md_path = local_path / agent_client.agent_file
         self.skills_dir = local_path / "skills"
         self.mcp_suggestions_path = local_path / "mcp_suggestions.md"
         self.suggestions_path = local_path / "suggestions.md"
+        # Learning file contents keyed by path, with the (mtime_ns, size) they were read at
+        self._file_cache: dict[Path, tuple[tuple[int, int], str]] = {}
 
         self.analysis_prompt = analysis_prompt or self._default_analysis_prompt()
+        self._formatter = string.Formatter()
+        # Parse the prompt once, so a bad placeholder fails here rather than after a PR run
+        self._prompt_parts = list(self._formatter.parse(self.analysis_prompt))
+        self._prompt_fields = set()
+        for _, field_name, format_spec, _ in self._prompt_parts:
+            if field_name is None:
+                continue
+            # Placeholders like {pr_title[0]} or {pr_title.upper} are rooted at pr_title
+            root = field_name.partition(".")[0].partition("[")[0]
+            if not root or root.isdigit():
+                raise ValueError(
+                    f"Positional placeholder {{{field_name}}} in analysis prompt, "
+                    f"use a named one such as {{pr_title}}"
+                )
+            if format_spec and "{" in format_spec:
+                raise ValueError(
+                    f"Nested placeholder in the format spec of {{{field_name}:{format_spec}}} "
+                    "in analysis prompt is not supported, use a literal format spec"
+                )
+            self._prompt_fields.add(root)
+        unknown_fields = self._prompt_fields - ANALYSIS_PROMPT_FIELDS
+        if unknown_fields:
+            raise ValueError(
+                f"Unknown placeholders in analysis prompt: {', '.join(sorted(unknown_fields))}"
+            )
 
     def _initialize_files(self) -> None:
-        """Initialize learning files if they don't exist."""
+        """Initialize learning files (and the learning directory) if they don't exist."""
         self.skills_dir.mkdir(parents=True, exist_ok=True)
 
         if not self.mcp_suggestions_path.exists():
@@ -78,21 +130,22 @@ class UnifiedAnalyzer:
             pr_info: PR information
 
         """
-        # Read current state of files for context
-        current_agent_md = self.agent_md_path.read_text() if self.agent_md_path.exists() else ""
-        current_skills = self._get_current_skills_summary()
-        current_mcp = (
-            self.mcp_suggestions_path.read_text()
-            if self.mcp_suggestions_path.exists()
-            else "(No MCP suggestions yet)"
-        )
+        # Read current state of files for context, skipping those the prompt doesn't use
+        current_agent_md = current_skills = current_mcp = ""
+        if "current_agent_md" in self._prompt_fields:
+            current_agent_md = self._read_cached(self.agent_md_path) or ""
+        if "current_skills" in self._prompt_fields:
+            current_skills = self._get_current_skills_summary()
+        if "current_mcp" in self._prompt_fields:
+            mcp_content = self._read_cached(self.mcp_suggestions_path)
+            current_mcp = "(No MCP suggestions yet)" if mcp_content is None else mcp_content
 
         # Format solutions for comparison
         dev_solution_text = self._format_solution(developer_solution, "Developer")
         agent_solution_text = self._format_solution(agent_solution, self.agent_client.agent_name)
 
         # Build prompt
-        prompt = self.analysis_prompt.format(
+        prompt = self._render_prompt(
             pr_number=pr_info.number,
             pr_title=pr_info.title,
             pr_description=pr_info.description or "No description",
@@ -111,19 +164,49 @@ class UnifiedAnalyzer:
         # Run the agent interactively - it will edit files directly
         self.agent_client.run_analysis(prompt, self.learning_dir)
 
+    def _read_cached(self, path: Path) -> str | None:
+        """Read a learning file, reusing the last read while it is unchanged on disk."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._file_cache.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        content = path.read_text()
+        self._file_cache[path] = (version, content)
+        return content
+
+    def _render_prompt(self, **values: object) -> str:
+        """Render the pre-parsed analysis prompt, like str.format."""
+        parts = []
+        for literal_text, field_name, format_spec, conversion in self._prompt_parts:
+            parts.append(literal_text)
+            if field_name is not None:
+                value, _ = self._formatter.get_field(field_name, (), values)
+                value = self._formatter.convert_field(value, conversion)
+                parts.append(self._formatter.format_field(value, format_spec or ""))
+        return "".join(parts)
+
     def _format_solution(self, solution: Solution, label: str) -> str:
         """Format a solution for display in prompt."""
-        lines = [f"## {label} Solution\n"]
-        lines.append(f"**Description:** {solution.description}\n")
+        # Write straight into one buffer, file contents can be large
+        buffer = io.StringIO()
+        buffer.write(f"## {label} Solution\n\n**Description:** {solution.description}\n")
 
         if solution.reasoning:
-            lines.append(f"**Reasoning:** {solution.reasoning}\n")
+            buffer.write(f"\n**Reasoning:** {solution.reasoning}\n")
 
-        lines.append("\n**Files Changed:**\n")
+        buffer.write("\n\n**Files Changed:**\n")
         for filename, content in solution.files.items():
-            lines.append(f"\n### {filename}\n```\n{content}\n```\n")
+            buffer.write(f"\n\n### {filename}\n```\n")
+            buffer.write(content)
+            buffer.write("\n```\n")
 
-        return "\n".join(lines)
+        return buffer.getvalue()
 
     def _default_analysis_prompt(self) -> str:
         """Default prompt for analysis."""
@@ -189,16 +272,35 @@ so just not be focused on this single PR, but on broader learnings.
 
     def _get_current_skills_summary(self) -> str:
         """Get summary of all current skills."""
-        if not self.skills_dir.exists() or not list(self.skills_dir.iterdir()):
+        try:
+            # scandir entries carry the file type, no extra stat per skill folder
+            with os.scandir(self.skills_dir) as entries:
+                skill_folders = sorted(
+                    (entry for entry in entries if entry.is_dir()), key=lambda entry: entry.name
+                )
+        except FileNotFoundError:
             return "(No skills learned yet)"
 
         skills_summary = []
-        for skill_folder in sorted(self.skills_dir.iterdir()):
-            if skill_folder.is_dir():
-                skill_file = skill_folder / "SKILL.md"
-                if skill_file.exists():
-                    content = skill_file.read_text()
-                    skills_summary.append(f"### {skill_folder.name}\n{content[:500]}...\n")
+        summary_size = 0
+        for skill_folder in skill_folders:
+            try:
+                # Read only the preview (UTF-8 needs at most 4 bytes per character),
+                # plus one byte to tell whether there is more
+                with open(os.path.join(skill_folder.path, "SKILL.md"), "rb") as f:
+                    head = f.read(SKILL_PREVIEW_CHARS * 4 + 1)
+            except FileNotFoundError:
+                continue
+            content = head.decode("utf-8", errors="replace")
+            if len(content) > SKILL_PREVIEW_CHARS:
+                content = content[:SKILL_PREVIEW_CHARS] + "..."
+            entry = f"### {skill_folder.name}\n{content}\n"
+
+            summary_size += len(entry)
+            if summary_size > SKILLS_SUMMARY_BUDGET:
+                skills_summary.append("(More skills in skills/ not shown)")
+                break
+            skills_summary.append(entry)
 
         return "\n".join(skills_summary) if skills_summary else "(No skills learned yet)"
 
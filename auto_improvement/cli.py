@@ -23,6 +23,9 @@ app = typer.Typer(
 
 console = Console()
 
+# Issue trackers accepted by `init --tracker`, mapped to their config client names
+TRACKER_CLIENTS = {"github": "github_issues", "trac": "trac", "jira": "jira"}
+
 
 def _validate_repo_format(repo: str) -> None:
     """Validate that repo is in 'owner/repo' format."""
@@ -45,6 +48,9 @@ def run(
     max_prs: Annotated[
         int | None, typer.Option("--max-prs", "-n", help="Maximum PRs to process")
     ] = None,
+    no_docker: Annotated[
+        bool, typer.Option("--no-docker", help="Run the agent on the host, without Docker")
+    ] = False,
 ) -> None:
     """Run auto-improvement cycle on a repository."""
     try:
@@ -54,6 +60,7 @@ def run(
             repo_path=repo,
             config_path=config,
             agent_config_path=agent_md,
+            no_docker=no_docker,
         )
 
         # Run improvement cycle
@@ -82,6 +89,9 @@ def run_pr(
     agent_md: Annotated[
         Path | None, typer.Option("--agent-md", help="Path to CLAUDE.md or similar file")
     ] = None,
+    no_docker: Annotated[
+        bool, typer.Option("--no-docker", help="Run the agent on the host, without Docker")
+    ] = False,
 ) -> None:
     """Process a specific PR."""
     try:
@@ -91,6 +101,7 @@ def run_pr(
             repo_path=repo,
             config_path=config,
             agent_config_path=agent_md,
+            no_docker=no_docker,
         )
 
         # Run on specific PR
@@ -130,39 +141,21 @@ def init(
         if not project_name:
             project_name = repo.split("/")[-1].title()
 
-        # Create default config
-        if issue_tracker == "github":
-            from auto_improvement.issues_tracker_clients.github_issues_client import (
-                GitHubIssuesClient,
-            )
-
-            tracker_config = IssueTrackerConfig(
-                client=GitHubIssuesClient,
-                url=tracker_url or f"https://github.com/{repo}/issues",
-            )
-        elif issue_tracker == "trac":
-            from auto_improvement.issues_tracker_clients.trac_client import TracClient
-
-            if not tracker_url:
-                console.print("[red]Error: --tracker-url required for Trac[/red]")
-                raise typer.Exit(1) from None
-            tracker_config = IssueTrackerConfig(
-                client=TracClient,
-                url=tracker_url,
-            )
-        elif issue_tracker == "jira":
-            from auto_improvement.issues_tracker_clients.jira_client import JiraClient
-
-            if not tracker_url:
-                console.print("[red]Error: --tracker-url required for Jira[/red]")
-                raise typer.Exit(1) from None
-            tracker_config = IssueTrackerConfig(
-                client=JiraClient,
-                url=tracker_url,
-            )
-        else:
+        # Create default config, the tracker client class is resolved by IssueTrackerConfig
+        client_name = TRACKER_CLIENTS.get(issue_tracker)
+        if client_name is None:
             console.print(f"[red]Error: Unknown tracker type: {issue_tracker}[/red]")
             raise typer.Exit(1) from None
+        if issue_tracker != "github" and not tracker_url:
+            console.print(f"[red]Error: --tracker-url required for {issue_tracker.title()}[/red]")
+            raise typer.Exit(1) from None
+
+        tracker_config = IssueTrackerConfig.model_validate(
+            {
+                "client": client_name,
+                "url": tracker_url or f"https://github.com/{repo}/issues",
+            }
+        )
 
         project_config = ProjectConfig(
             name=project_name,
@@ -1,35 +1,41 @@
 """Configuration management."""
 
-import logging
+import types
 from pathlib import Path
 
 import yaml
 
 from auto_improvement.models import Config
 
-logger = logging.getLogger(__name__)
+try:
+    # libyaml-backed emitter, much faster than the pure-Python one
+    from yaml import CSafeDumper as _SafeDumper
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+
+
+class _ConfigDumper(_SafeDumper):
+    """YAML dumper that writes class objects as their import path and anything else as str."""
+
+
+def _represent_type(dumper: _SafeDumper, obj: type | types.GenericAlias) -> yaml.Node:
+    return dumper.represent_str(f"{obj.__module__}.{obj.__qualname__}")
+
+
+def _represent_other(dumper: _SafeDumper, obj: object) -> yaml.Node:
+    return dumper.represent_str(str(obj))
+
+
+# Replace classes/types (including ABCMeta instances) with module.qualname
+_ConfigDumper.add_multi_representer(type, _represent_type)
+_ConfigDumper.add_representer(types.GenericAlias, _represent_type)
+_ConfigDumper.add_multi_representer(object, _represent_other)
 
 
 def save_config(config: Config, config_path: Path) -> None:
     """Save configuration to YAML file."""
     config_path.parent.mkdir(parents=True, exist_ok=True)
 
-    def _replace_types(obj: object) -> object:
-        """Recursively replace class/type objects with import path strings for YAML serialization."""
-        if isinstance(obj, dict):
-            return {k: _replace_types(v) for k, v in obj.items()}
-        if isinstance(obj, list):
-            return [_replace_types(v) for v in obj]
-        # Replace classes/types (including ABCMeta instances) with module.qualname
-        try:
-            import types
-
-            if isinstance(obj, type | types.GenericAlias):
-                return f"{obj.__module__}.{obj.__qualname__}"
-        except Exception as e:
-            logger.debug(f"Could not serialize type object: {e}")
-        return obj
-
     # Exclude client class objects from model_dump so Pydantic does not attempt
     # to serialize runtime class objects (which use ABCMeta and are not JSON-serializable).
     exclude = {
@@ -39,23 +45,6 @@ def save_config(config: Config, config_path: Path) -> None:
     }
     data = config.model_dump(mode="json", exclude=exclude)
 
-    # Ensure all non-serializable objects (like class objects / ABCMeta) are turned
-    # into strings by going through JSON with a safe `default` handler, then
-    # loading back to Python for YAML dumping.
-    import json
-
-    def _json_default(o: object) -> str:
-        try:
-            # For classes/types, use full import path
-            if isinstance(o, type):
-                return f"{o.__module__}.{o.__qualname__}"
-            return str(o)
-        except Exception as e:
-            logger.debug(f"JSON serialization fallback for {type(o)}: {e}")
-            return str(type(o))
-
-    json_text = json.dumps(data, default=_json_default)
-    safe_data = json.loads(json_text)
-
+    # Any remaining non-serializable objects are turned into strings by the dumper
     with open(config_path, "w") as f:
-        yaml.dump(safe_data, f, default_flow_style=False, sort_keys=False)
+        yaml.dump(data, f, Dumper=_ConfigDumper, default_flow_style=False, sort_keys=False)
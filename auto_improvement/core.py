@@ -1,17 +1,29 @@
 """Core auto-improvement orchestrator."""
 
+import contextlib
+import functools
+import hashlib
 import json
+import logging
 import random
-from datetime import UTC, datetime
+import shutil
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 import yaml
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn
 
+from auto_improvement.agent_clients.abstract_agent import AbstractAgentClient
 from auto_improvement.analyzer import UnifiedAnalyzer
 from auto_improvement.git_manager import GitManager
+from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
+    AbstractIssueTrackerClient,
+)
 from auto_improvement.models import (
     Config,
     ImprovementRun,
@@ -20,17 +32,40 @@ from auto_improvement.models import (
     PRInfo,
     Solution,
 )
+from auto_improvement.version_control_clients.abstract_version_control_client import (
+    AbstractVersionControlClient,
+)
+
+try:
+    # libyaml-backed parser, much faster than the pure-Python one
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Repository metadata fetched from GitHub is reused for this long
+REPO_INFO_TTL = timedelta(hours=24)
 
 
 def load_config(config_path: Path | None = None) -> Config:
     """Load configuration from YAML file or use defaults."""
     if config_path and config_path.exists():
-        with open(config_path) as f:
-            config_data = yaml.safe_load(f)
-        return Config(**config_data)
+        stat = config_path.stat()
+        config = _load_config_file(config_path.resolve(), stat.st_mtime_ns, stat.st_size)
+        # Callers adjust their config, so each one gets its own copy
+        return config.model_copy(deep=True)
     return Config()
 
 
+@functools.lru_cache(maxsize=16)
+def _load_config_file(config_path: Path, mtime_ns: int, size: int) -> Config:
+    """Parse a config file; cached until the file changes on disk."""
+    with open(config_path) as f:
+        config_data = yaml.load(f, Loader=_SafeLoader)
+    return Config(**config_data)
+
+
 class AutoImprovement:
     """Main orchestrator for the auto-improvement system."""
 
@@ -39,6 +74,7 @@ class AutoImprovement:
         repo_path: str,
         config_path: Path | None = None,
         agent_config_path: Path | None = None,
+        no_docker: bool = False,
     ):
         """
         Initialize the auto-improvement system.
@@ -47,29 +83,27 @@ class AutoImprovement:
             repo_path: GitHub repo in format "owner/repo"
             config_path: Path to configuration YAML file
             agent_config_path: Path to agent config file (e.g., CLAUDE.md)
+            no_docker: Run the agent directly on the host instead of in Docker
 
         """
         self.console = Console()
+        # One progress display for the whole run; each step adds and removes its own task
+        self._progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=self.console,
+        )
 
         # Load configuration
         self.config = load_config(config_path)
         self.config.project.repo = repo_path
+        if no_docker:
+            self.config.agent_config.use_docker = False
 
         # Set up paths
         self.agent_md_path = agent_config_path
         self.repo_path = repo_path
 
-        # Initialize clients - the validators ensure these are never None after config load
-        issue_tracker_client_class = self.config.issue_tracker.client
-        if issue_tracker_client_class is None:
-            raise ValueError("Issue tracker client not configured")
-        self.issue_tracker_client = issue_tracker_client_class(self.config.issue_tracker)
-
-        version_control_client_class = self.config.version_control_config.client
-        if version_control_client_class is None:
-            raise ValueError("Version control client not configured")
-        self.github_client = version_control_client_class(self.issue_tracker_client)
-
         self.git_manager = GitManager(
             repo_url=repo_path,
             local_path=self.config.project.local_path,
@@ -80,30 +114,71 @@ class AutoImprovement:
         self.learning_dir = self.git_manager.local_path.parent / (
             self.git_manager.local_path.name + "-learning"
         )
-        self.learning_dir.mkdir(parents=True, exist_ok=True)
-
-        agent_client_class = self.config.agent_config.client
-        if agent_client_class is None:
-            raise ValueError("Agent client not configured")
-        self.agent_client = agent_client_class(
-            config=self.config.agent_config,
-            working_dir=self.git_manager.local_path,
-        )
-
-        # Initialize unified analyzer with learning directory separate from repo
-        analysis_prompt = self.config.prompts.analysis
-        self.analyzer = UnifiedAnalyzer(
-            agent_client=self.agent_client,
-            local_path=self.learning_dir,
-            analysis_prompt=analysis_prompt,
-        )
 
         # State
         self.current_run: ImprovementRun | None = None
 
         # Tracking files for PRs (in learning dir, not repo)
         self.analyzed_prs_file = self.learning_dir / ".analyzed_prs.json"
+        # PRs analyzed this session are appended here and compacted into the JSON file
+        self.analyzed_prs_log = self.learning_dir / ".analyzed_prs.jsonl"
         self.skipped_prs_file = self.learning_dir / ".skipped_prs.json"
+        self.pr_cache_file = self.learning_dir / ".pr_cache.json"
+        self.repo_info_file = self.learning_dir / ".repo_info.json"
+        self._repo_info: dict[str, Any] | None = None
+        self._analyzed_prs: set[int] | None = None
+        # PRs processed in parallel share the learning files
+        self._analysis_lock = threading.Lock()
+        # PRs are enriched concurrently and share the skipped PRs file
+        self._skipped_prs_lock = threading.Lock()
+
+    # Clients are created on first use, so inspecting state doesn't build them all
+
+    @functools.cached_property
+    def issue_tracker_client(self) -> AbstractIssueTrackerClient:
+        """Issue tracker client - the validators ensure it is never None after config load."""
+        issue_tracker_client_class = self.config.issue_tracker.client
+        if issue_tracker_client_class is None:
+            raise ValueError("Issue tracker client not configured")
+        return issue_tracker_client_class(self.config.issue_tracker)
+
+    @functools.cached_property
+    def github_client(self) -> AbstractVersionControlClient:
+        """Version control client - the validators ensure it is never None after config load."""
+        version_control_client_class = self.config.version_control_config.client
+        if version_control_client_class is None:
+            raise ValueError("Version control client not configured")
+        return version_control_client_class(self.issue_tracker_client)
+
+    @functools.cached_property
+    def agent_client(self) -> AbstractAgentClient:
+        """Agent client working in the repository."""
+        return self._create_agent_client(self.git_manager.local_path)
+
+    @functools.cached_property
+    def analyzer(self) -> UnifiedAnalyzer:
+        """Unified analyzer with learning directory separate from repo."""
+        return UnifiedAnalyzer(
+            agent_client=self.agent_client,
+            local_path=self.learning_dir,
+            analysis_prompt=self.config.prompts.analysis,
+        )
+
+    def _create_agent_client(self, working_dir: Path) -> AbstractAgentClient:
+        """Create an agent client working in the given directory."""
+        agent_client_class = self.config.agent_config.client
+        if agent_client_class is None:
+            raise ValueError("Agent client not configured")
+        return agent_client_class(config=self.config.agent_config, working_dir=working_dir)
+
+    @contextlib.contextmanager
+    def _progress_task(self, description: str) -> Iterator[TaskID]:
+        """Show a spinner task on the shared progress display while the block runs."""
+        task = self._progress.add_task(description, total=None)
+        try:
+            yield task
+        finally:
+            self._progress.remove_task(task)
 
     def run_improvement_cycle(
         self,
@@ -128,29 +203,40 @@ class AutoImprovement:
 
         self.console.print("\n[bold cyan]🚀 Starting Auto-Improvement Cycle[/bold cyan]\n")
 
-        # Step 1: Clone/update repository
-        self._setup_repository()
+        # Authentication may prompt in the terminal, which the progress display would garble
+        self.agent_client.prepare()
 
-        # Step 2: Research
-        self._research_phase()
+        with self._progress:
+            # Step 1: Clone/update repository
+            self._setup_repository()
 
-        # Step 3: Select PRs
-        if specific_pr:
-            prs = [self.github_client.get_pr(self.repo_path, specific_pr)]
-        else:
-            prs = self._select_prs(max_iterations)
+            # Step 2: Research
+            self._research_phase()
 
-        self.console.print(f"\n[bold]Selected {len(prs)} PRs for learning[/bold]\n")
+            # Step 3: Select PRs
+            if specific_pr:
+                prs = [self.github_client.get_pr(self.repo_path, specific_pr)]
+            else:
+                prs = self._select_prs(max_iterations)
 
-        # Step 4: Process each PR
-        for pr in prs:
-            session = self._process_pr(pr)
-            self.current_run.sessions.append(session)
+            self.console.print(f"\n[bold]Selected {len(prs)} PRs for learning[/bold]\n")
 
-            # Update stats
-            self.current_run.total_prs += 1
-            if session.success:
-                self.current_run.successful_prs += 1
+            # Make sure every commit the PRs check out or read is local, in one fetch
+            self.git_manager.prefetch_commits(
+                [sha for pr in prs for sha in (pr.base_commit_sha, pr.merge_commit_sha)]
+            )
+
+            # Step 4: Process each PR
+            try:
+                for session in self._process_prs(prs):
+                    self.current_run.sessions.append(session)
+
+                    # Update stats
+                    self.current_run.total_prs += 1
+                    if session.success:
+                        self.current_run.successful_prs += 1
+            finally:
+                self._compact_analyzed_prs()
 
         # Step 5: Calculate final stats
         self._finalize_run()
@@ -167,44 +253,88 @@ class AutoImprovement:
             )
             return
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task(
-                f"🔍 Researching project with {self.agent_client.agent_name}...", total=None
-            )
-
+        with self._progress_task(
+            f"🔍 Researching project with {self.agent_client.agent_name}..."
+        ) as task:
             repo_info = self._fetch_repo_info()
 
-            progress.update(task, description="🧠 Building research prompt...")
+            self._progress.update(task, description="🧠 Building research prompt...")
 
             # Build research prompt
             research_prompt = self._build_research_prompt(repo_info)
 
-            progress.update(task, description="🤖 Performing research with AI agent...")
-            # Use CAgentlaude to analyze and create initial file
-            self._perform_research(research_prompt)
-
-            progress.update(task, completed=True)
+            # Reuse a recent run's output for the same prompt; the code drifts, so not forever
+            ttl = timedelta(hours=self.config.learning.research_cache_ttl_hours)
+            cache_file = self._get_research_cache_file(research_prompt)
+            self.learning_dir.mkdir(parents=True, exist_ok=True)
+            if ttl and self._is_research_cache_fresh(cache_file, ttl):
+                self._progress.update(task, description="♻️  Reusing cached research...")
+                shutil.copyfile(cache_file, self.analyzer.agent_md_path)
+            else:
+                self._progress.update(task, description="🤖 Performing research with AI agent...")
+                # Use CAgentlaude to analyze and create initial file
+                self._perform_research(research_prompt)
+                if ttl:
+                    cache_file.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(self.analyzer.agent_md_path, cache_file)
 
         self.console.print(
             f"[green]✓[/green] Research completed and {self.agent_client.agent_file} created\n"
         )
 
+    def _get_research_cache_file(self, research_prompt: str) -> Path:
+        """Get the cache file for research output, outside the learning dir so resets keep it."""
+        key = hashlib.sha256(research_prompt.encode()).hexdigest()[:16]
+        return (
+            Path.home()
+            / ".auto-improve"
+            / "research-cache"
+            / f"{key}-{self.agent_client.agent_file}"
+        )
+
+    @staticmethod
+    def _is_research_cache_fresh(cache_file: Path, ttl: timedelta) -> bool:
+        """Check whether cached research output exists and was written within the TTL."""
+        try:
+            mtime = cache_file.stat().st_mtime
+        except FileNotFoundError:
+            return False
+        return datetime.now(UTC) - datetime.fromtimestamp(mtime, UTC) <= ttl
+
     def _fetch_repo_info(self) -> dict[str, Any]:
-        """Fetch repository information."""
+        """Fetch repository information, reusing a recent copy from the learning dir."""
+        if self._repo_info is not None:
+            return self._repo_info
+
+        try:
+            data = json.loads(self.repo_info_file.read_text())
+            fetched_at = datetime.fromisoformat(data["fetched_at"])
+            if data["repo"] == self.repo_path and datetime.now(UTC) - fetched_at < REPO_INFO_TTL:
+                self._repo_info = data["info"]
+                return self._repo_info
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+            pass
+
         try:
             # Check if the client has get_repo_info method (GitHubClient does)
             if hasattr(self.github_client, "get_repo_info"):
                 info: dict[str, Any] = self.github_client.get_repo_info(self.repo_path)
-                return info
-            return {}
+            else:
+                return {}
         except Exception as e:
             self.console.print(f"[yellow]⚠[/yellow] Could not fetch repo info: {e}")
             return {}
 
+        self._repo_info = info
+        cache_data = {
+            "repo": self.repo_path,
+            "fetched_at": datetime.now(UTC).isoformat(),
+            "info": info,
+        }
+        self.learning_dir.mkdir(parents=True, exist_ok=True)
+        self.repo_info_file.write_text(json.dumps(cache_data))
+        return info
+
     def _build_research_prompt(self, repo_info: dict[str, Any]) -> str:
         """Build the research prompt."""
         repo_name = repo_info.get("name", self.repo_path)
@@ -269,42 +399,25 @@ Please provide the complete {self.agent_client.agent_name} content that will hel
 
     def _setup_repository(self) -> None:
         """Clone or update repository."""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task("📦 Setting up repository...", total=None)
-
+        with self._progress_task("📦 Setting up repository..."):
             self.git_manager.clone_or_update()
             self.analyzer._initialize_files()
 
-            progress.update(task, completed=True)
-
         self.console.print("[green]✓[/green] Repository ready\n")
 
     def _select_prs(self, limit: int) -> list[PRInfo]:
         """Select PRs for learning."""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task("🎯 Finding suitable PRs...", total=None)
-
+        with self._progress_task("🎯 Finding suitable PRs..."):
             # Load already analyzed PRs to skip them
-            analyzed_prs = self._load_analyzed_prs()
+            analyzed_prs = self._get_analyzed_prs()
             if analyzed_prs:
                 self.console.print(f"[dim]Skipping {len(analyzed_prs)} already analyzed PRs[/dim]")
 
             # Fetch more PRs than needed to account for skipping analyzed ones
             enriched_prs = self.search_prs(limit, analyzed_prs)
 
-            # Shuffle and take limit
-            random.shuffle(enriched_prs)
-            selected = enriched_prs[:limit]
-
-            progress.update(task, completed=True)
+            # Pick limit PRs at random
+            selected = random.sample(enriched_prs, k=min(limit, len(enriched_prs)))
 
         return selected
 
@@ -312,48 +425,56 @@ Please provide the complete {self.agent_client.agent_name} content that will hel
         # Load skipped PRs (no linked issue found previously)
         skipped_prs = self._load_skipped_prs()
 
-        fetch_limit = limit + len(analyzed_prs) + len(skipped_prs) + 10 + offset
+        # Already processed PRs are excluded up front instead of fetched and dropped
+        fetch_limit = limit + 10 + offset
+        return self._get_merged_prs(fetch_limit, analyzed_prs | skipped_prs)
+
+    def _enrich_pr(self, pr: PRInfo) -> PRInfo | None:
+        """Ensure a PR has its linked issue, or record it as skipped and return None."""
+        logger.debug("Processing PR #%d: %s", pr.number, pr.title)
+        if pr.linked_issue:
+            return pr
+
+        # Try to fetch from issue tracker
+        logger.debug("PR #%d: no linked issue, trying to extract from PR description", pr.number)
+        issue_info = self._extract_issue_id_from_pr(pr)
+        if issue_info:
+            pr.linked_issue = issue_info
+            return pr
+
+        # Save to skipped list so we don't check again
+        logger.debug("PR #%d: no linked issue found, adding to skip list", pr.number)
+        self._save_skipped_pr(pr.number, "no linked issue found")
+        return None
+
+    def _get_merged_prs(self, limit: int, exclude: set[int]) -> list[PRInfo]:
+        """Fetch merged PRs with a linked issue, reusing a recent cached listing that covers them."""
+        criteria = self.config.pr_selection.model_dump(mode="json")
+        cached_prs = self._load_pr_cache(criteria, limit, exclude)
+        if cached_prs is not None:
+            self.console.print(f"[dim]Using {len(cached_prs)} cached PRs[/dim]")
+            return [pr for pr in cached_prs if pr.linked_issue]
+
         prs = self.github_client.get_merged_prs(
-            self.repo_path,
-            self.config.pr_selection,
-            limit=fetch_limit,
+            self.repo_path, self.config.pr_selection, limit=limit, exclude=exclude
         )
 
-        # Enrich with issue information, skipping already processed PRs
-        enriched_prs = []
-        for pr in prs:
-            # Skip already analyzed PRs
-            if pr.number in analyzed_prs:
-                self.console.print(f"[dim]Skipping PR #{pr.number}: already analyzed[/dim]")
-                continue
-
-            # Skip PRs that were previously found to have no linked issue
-            if pr.number in skipped_prs:
-                self.console.print(
-                    f"[dim]Skipping PR #{pr.number}: previously found no linked issue[/dim]"
-                )
-                continue
-
-            self.console.print(f"Processing PR #{pr.number}: {pr.title}")
-            if pr.linked_issue:
-                enriched_prs.append(pr)
-            else:
-                # Try to fetch from issue tracker
-                self.console.print(
-                    "  [dim]No linked issue, trying to extract from PR description...[/dim]"
-                )
-                issue_info = self._extract_issue_id_from_pr(pr)
-                if issue_info:
-                    pr.linked_issue = issue_info
-                    enriched_prs.append(pr)
-                else:
-                    # Save to skipped list so we don't check again
-                    self.console.print(
-                        f"  [yellow]PR #{pr.number}: no linked issue found, "
-                        "adding to skip list[/yellow]"
-                    )
-                    self._save_skipped_pr(pr.number, "no linked issue found")
-        return enriched_prs
+        candidates = [pr for pr in prs if pr.number not in exclude]
+
+        # The listing already looked up linked issues for its PRs in the GitHub client's
+        # pool; retry the ones left without one, overlapping the issue tracker requests
+        with ThreadPoolExecutor(max_workers=self.config.learning.enrichment_workers) as executor:
+            enriched_prs = list(executor.map(self._enrich_pr, candidates))
+
+        found_prs = [pr for pr in enriched_prs if pr is not None]
+        skipped_count = len(enriched_prs) - len(found_prs)
+        if skipped_count:
+            self.console.print(f"[dim]Skipped {skipped_count} PRs without a linked issue[/dim]")
+
+        # Enrichment fills in linked issues in place, so the cache keeps them
+        if self.config.learning.pr_cache_ttl_hours > 0:
+            self._save_pr_cache(criteria, limit, exclude, prs)
+        return found_prs
 
     def _extract_issue_id_from_pr(self, pr: PRInfo) -> IssueInfo | None:
         """Extract issue ID from PR title and description and fetch issue info."""
@@ -361,82 +482,107 @@ Please provide the complete {self.agent_client.agent_name} content that will hel
         combined_text = f"{pr.title}\n{pr.description or ''}"
         return self.issue_tracker_client.extract_issue_id_from_pr(combined_text)
 
+    def _process_prs(self, prs: list[PRInfo]) -> Iterator[ImprovementSession]:
+        """Process PRs one by one, or several at once in worktrees if configured."""
+        parallel_prs = self.config.learning.parallel_prs
+        if parallel_prs == 1 or len(prs) < 2:
+            for pr in prs:
+                yield self._process_pr(pr)
+            return
+
+        with ThreadPoolExecutor(max_workers=parallel_prs) as executor:
+            yield from executor.map(self._process_pr_in_worktree, prs)
+
     def _process_pr(self, pr: PRInfo) -> ImprovementSession:
-        """Process a single PR."""
-        self.console.print(f"\n[bold blue]━━━ PR #{pr.number}: {pr.title} ━━━[/bold blue]")
+        """Process a single PR in the main checkout."""
+        self._print_pr_header(pr)
 
-        if pr.linked_issue:
-            self.console.print(f"📋 Issue: {pr.linked_issue.title}")
-            self.console.print(f"🔗 {pr.linked_issue.url}\n")
+        # Time travel to before PR
+        self._time_travel_before_pr(pr)
 
-        session = ImprovementSession(
-            pr_info=pr,
-            attempts=0,
-            success=False,
-            best_score=0.0,
+        return self._solve_and_learn(
+            pr, self.git_manager, self.agent_client, self.analyzer.agent_md_path
         )
 
-        # Try multiple attempts
-        for attempt in range(1, self.config.learning.max_attempts_per_pr + 1):
-            self.console.print(
-                f"\n[yellow]⚙️  Attempt {attempt}/{self.config.learning.max_attempts_per_pr}[/yellow]"
-            )
+    def _process_pr_in_worktree(self, pr: PRInfo) -> ImprovementSession:
+        """Process a PR in its own git worktree so solutions for several PRs run at once."""
+        self._print_pr_header(pr)
 
-            session.attempts = attempt
+        with self._progress_task(f"🌳 Checking out PR #{pr.number} in a worktree..."):
+            worktree = self.git_manager.add_worktree(pr.base_commit_sha, f"pr-{pr.number}")
+        agent_client = self._create_agent_client(worktree.local_path)
 
-            # Time travel to before PR
-            self._time_travel_before_pr(pr)
+        # The agent gets a private snapshot of the learnings: whatever it does to the file
+        # can't overwrite what another PR's analysis writes meanwhile
+        agent_md_snapshot = None
+        if self.analyzer.agent_md_path.exists():
+            agent_md_snapshot = worktree.local_path.parent / (
+                f"{worktree.local_path.name}-{agent_client.agent_file}"
+            )
+            shutil.copyfile(self.analyzer.agent_md_path, agent_md_snapshot)
 
-            # Generate solution
-            claude_solution = self._generate_solution(pr)
-            session.claude_solution = claude_solution
+        try:
+            return self._solve_and_learn(pr, worktree, agent_client, agent_md_snapshot)
+        finally:
+            agent_client.close()
+            if agent_md_snapshot:
+                agent_md_snapshot.unlink(missing_ok=True)
+            self.git_manager.remove_worktree(worktree)
+
+    def _print_pr_header(self, pr: PRInfo) -> None:
+        """Print the PR being processed and its linked issue."""
+        self.console.print(f"\n[bold blue]━━━ PR #{pr.number}: {pr.title} ━━━[/bold blue]")
 
-            # Get developer solution
-            developer_solution = self.git_manager.get_pr_solution(pr)
-            session.developer_solution = developer_solution
+        if pr.linked_issue:
+            self.console.print(f"📋 Issue: {pr.linked_issue.title}")
+            self.console.print(f"🔗 {pr.linked_issue.url}\n")
 
+    def _solve_and_learn(
+        self,
+        pr: PRInfo,
+        git_manager: GitManager,
+        agent_client: AbstractAgentClient,
+        agent_md_path: Path | None,
+    ) -> ImprovementSession:
+        """Generate a solution in a checkout of the PR's base and learn from the comparison."""
+        # Each PR gets a single attempt: the analysis always completes it
+        session = ImprovementSession(pr_info=pr, attempts=1, success=False, best_score=0.0)
+
+        # Generate solution
+        claude_solution = self._generate_solution(pr, agent_client, agent_md_path)
+        session.claude_solution = claude_solution
+
+        # Get developer solution
+        developer_solution = git_manager.get_pr_solution(pr)
+        session.developer_solution = developer_solution
+
+        # Learning files are shared, so analyses of PRs processed in parallel run one at a time
+        with self._analysis_lock:
             # Unified analysis: compare solutions and update all learning files
             # Claude runs interactively and edits learning files directly
             self._analyze_and_learn(developer_solution, claude_solution, pr)
 
-            session.success = True
-            self.console.print("[bold green]✅ Analysis complete![/bold green]")
-
             # Save PR as analyzed so it won't be processed again
             self._save_analyzed_pr(pr.number)
-            break
+
+        session.success = True
+        self.console.print(f"[bold green]✅ Analysis of PR #{pr.number} complete![/bold green]")
 
         return session
 
     def _time_travel_before_pr(self, pr: PRInfo) -> None:
         """Checkout code before PR."""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task("⏮️  Time traveling to before PR...", total=None)
-
+        with self._progress_task("⏮️  Time traveling to before PR..."):
             self.git_manager.checkout_before_pr(pr)
             self.git_manager.clean()  # Clean working directory
 
-            progress.update(task, completed=True)
-
-    def _generate_solution(self, pr: PRInfo) -> Solution:
+    def _generate_solution(
+        self, pr: PRInfo, agent_client: AbstractAgentClient, agent_md_path: Path | None
+    ) -> Solution:
         """Generate solution using Claude."""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task("🤖 Generating solution with Claude...", total=None)
-
+        with self._progress_task(f"🤖 Generating solution for PR #{pr.number} with Claude..."):
             # Generate solution
-            solution = self.agent_client.generate_solution(
-                pr, pr.linked_issue, self.analyzer.agent_md_path
-            )
-
-            progress.update(task, completed=True)
+            solution = agent_client.generate_solution(pr, pr.linked_issue, agent_md_path)
 
         return solution
 
@@ -447,20 +593,10 @@ Please provide the complete {self.agent_client.agent_name} content that will hel
         pr: PRInfo,
     ) -> None:
         """Analyze solutions and update all learning files (unified approach)."""
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-        ) as progress:
-            task = progress.add_task(
-                "🔄 Analyzing solutions and updating learning files...", total=None
-            )
-
+        with self._progress_task("🔄 Analyzing solutions and updating learning files..."):
             # Claude runs interactively and edits learning files directly
             self.analyzer.analyze_and_learn(developer_solution, claude_solution, pr)
 
-            progress.update(task, completed=True)
-
     def _finalize_run(self) -> None:
         """Finalize the improvement run."""
         if not self.current_run:
@@ -490,27 +626,91 @@ Please provide the complete {self.agent_client.agent_name} content that will hel
         )
         self.console.print("[bold cyan]━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━[/bold cyan]\n")
 
+    def _get_analyzed_prs(self) -> set[int]:
+        """Get the set of already analyzed PR numbers, loading it on first use."""
+        if self._analyzed_prs is None:
+            self._analyzed_prs = self._load_analyzed_prs()
+        return self._analyzed_prs
+
     def _load_analyzed_prs(self) -> set[int]:
-        """Load the set of already analyzed PR numbers."""
-        if not self.analyzed_prs_file.exists():
-            return set()
+        """Load analyzed PR numbers from the tracking file and its append log."""
+        analyzed: set[int] = set()
+        if self.analyzed_prs_file.exists():
+            try:
+                data = json.loads(self.analyzed_prs_file.read_text())
+                analyzed.update(data.get("analyzed_prs", []))
+            except (json.JSONDecodeError, KeyError):
+                pass
 
-        try:
-            data = json.loads(self.analyzed_prs_file.read_text())
-            return set(data.get("analyzed_prs", []))
-        except (json.JSONDecodeError, KeyError):
-            return set()
+        if self.analyzed_prs_log.exists():
+            for line in self.analyzed_prs_log.read_text().splitlines():
+                # Skip a line cut short by an interrupted write
+                with contextlib.suppress(ValueError):
+                    analyzed.add(int(line))
+        return analyzed
 
     def _save_analyzed_pr(self, pr_number: int) -> None:
-        """Save a PR number to the analyzed PRs tracking file."""
-        analyzed = self._load_analyzed_prs()
-        analyzed.add(pr_number)
+        """Record a PR number as analyzed by appending it to the analyzed PRs log."""
+        self._get_analyzed_prs().add(pr_number)
+        self.learning_dir.mkdir(parents=True, exist_ok=True)
+        with self.analyzed_prs_log.open("a") as f:
+            f.write(f"{pr_number}\n")
+
+    def _compact_analyzed_prs(self) -> None:
+        """Fold the analyzed PRs log into the tracking file."""
+        if not self.analyzed_prs_log.exists():
+            return
 
         data: dict[str, list[int] | str] = {
-            "analyzed_prs": sorted(analyzed),
+            "analyzed_prs": sorted(self._get_analyzed_prs()),
             "last_updated": datetime.now(UTC).isoformat(),
         }
         self.analyzed_prs_file.write_text(json.dumps(data, indent=2))
+        self.analyzed_prs_log.unlink()
+
+    def _load_pr_cache(
+        self, criteria: dict[str, Any], limit: int, exclude: set[int]
+    ) -> list[PRInfo] | None:
+        """Load the cached PR listing if it is fresh and was fetched with the same criteria."""
+        ttl = timedelta(hours=self.config.learning.pr_cache_ttl_hours)
+        if not ttl or not self.pr_cache_file.exists():
+            return None
+
+        try:
+            data = json.loads(self.pr_cache_file.read_text())
+            if (
+                data["repo"] != self.repo_path
+                or data["criteria"] != criteria
+                or datetime.now(UTC) - datetime.fromisoformat(data["fetched_at"]) > ttl
+                # PRs excluded back then but wanted now are missing from the listing
+                or not exclude.issuperset(data["exclude"])
+            ):
+                return None
+            cached_prs = data["prs"]
+            prs = [PRInfo.model_validate(pr) for pr in cached_prs if pr["number"] not in exclude]
+            cached_limit = data["limit"]
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return None
+
+        # A listing shorter than its limit already holds every matching PR
+        if len(prs) < limit and len(cached_prs) >= cached_limit:
+            return None
+        return prs[:limit]
+
+    def _save_pr_cache(
+        self, criteria: dict[str, Any], limit: int, exclude: set[int], prs: list[PRInfo]
+    ) -> None:
+        """Save a merged PR listing, including linked issues, to the PR cache file."""
+        data: dict[str, Any] = {
+            "repo": self.repo_path,
+            "criteria": criteria,
+            "limit": limit,
+            "exclude": sorted(exclude),
+            "fetched_at": datetime.now(UTC).isoformat(),
+            "prs": [pr.model_dump(mode="json") for pr in prs],
+        }
+        self.learning_dir.mkdir(parents=True, exist_ok=True)
+        self.pr_cache_file.write_text(json.dumps(data))
 
     def _load_skipped_prs(self) -> set[int]:
         """Load the set of PRs skipped for not matching criteria (no linked issue)."""
@@ -525,23 +725,25 @@ Please provide the complete {self.agent_client.agent_name} content that will hel
 
     def _save_skipped_pr(self, pr_number: int, reason: str = "no linked issue") -> None:
         """Save a PR number to the skipped PRs tracking file."""
-        skipped = self._load_skipped_prs()
-        skipped.add(pr_number)
-
-        # Load existing reasons if any
-        reasons: dict[str, str] = {}
-        if self.skipped_prs_file.exists():
-            try:
-                existing_data = json.loads(self.skipped_prs_file.read_text())
-                reasons = existing_data.get("reasons", {})
-            except (json.JSONDecodeError, KeyError):
-                pass
-
-        reasons[str(pr_number)] = reason
-
-        output_data: dict[str, Any] = {
-            "skipped_prs": sorted(skipped),
-            "reasons": reasons,
-            "last_updated": datetime.now(UTC).isoformat(),
-        }
-        self.skipped_prs_file.write_text(json.dumps(output_data, indent=2))
+        with self._skipped_prs_lock:
+            skipped = self._load_skipped_prs()
+            skipped.add(pr_number)
+
+            # Load existing reasons if any
+            reasons: dict[str, str] = {}
+            if self.skipped_prs_file.exists():
+                try:
+                    existing_data = json.loads(self.skipped_prs_file.read_text())
+                    reasons = existing_data.get("reasons", {})
+                except (json.JSONDecodeError, KeyError):
+                    pass
+
+            reasons[str(pr_number)] = reason
+
+            output_data: dict[str, Any] = {
+                "skipped_prs": sorted(skipped),
+                "reasons": reasons,
+                "last_updated": datetime.now(UTC).isoformat(),
+            }
+            self.learning_dir.mkdir(parents=True, exist_ok=True)
+            self.skipped_prs_file.write_text(json.dumps(output_data, indent=2))
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
+import shutil
 import subprocess
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
@@ -17,6 +18,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Partial clone: fetch commits and trees up front, file contents only when checked out.
+# Nothing is checked out until the first PR's base commit, so the default branch's files
+# are never fetched or written just to be replaced.
+CLONE_OPTIONS = ["--filter=blob:none", "--no-tags", "--no-checkout"]
+
 
 class GitManager:
     """Manages git operations for the improvement process."""
@@ -53,18 +59,51 @@ class GitManager:
             else:
                 full_url = self.repo_url
 
-            # Try a shallow clone first to avoid long stalls for large repos.
+            # Use a partial clone to avoid long stalls for large repos; checkouts of
+            # PR commits fetch the blobs they need on demand.
             # Disable git terminal prompts so clone fails fast on auth issues.
             env = os.environ.copy()
             env.setdefault("GIT_TERMINAL_PROMPT", "0")
 
             try:
-                self.repo = git.Repo.clone_from(full_url, self.local_path)
+                self.repo = git.Repo.clone_from(
+                    full_url, self.local_path, env=env, multi_options=CLONE_OPTIONS
+                )
             except subprocess.TimeoutExpired as e:
                 raise RuntimeError("git clone timed out") from e
 
         return self.repo
 
+    def prefetch_commits(self, commits: list[str]) -> None:
+        """
+        Fetch the given commits from origin in a single request.
+
+        Commits that are already present are skipped, so nothing is fetched when all of
+        them are. Commits that are no longer reachable from any branch (e.g. a base branch
+        that was force-pushed) are fetched together instead of failing each checkout.
+        """
+        if not self.repo:
+            raise ValueError("Repository not initialized. Call clone_or_update() first.")
+
+        commits = list(dict.fromkeys(commits))
+        if not commits:
+            return
+
+        # Lists the commits that are already present, without lazily fetching the others
+        present = set(
+            self.repo.git.rev_list(
+                "--no-walk", "--ignore-missing", "--missing=print", *commits
+            ).splitlines()
+        )
+        commits = [commit for commit in commits if commit not in present]
+        if not commits:
+            return
+
+        try:
+            self.repo.git.fetch("origin", *commits)
+        except git.GitCommandError as e:
+            logger.warning(f"Could not prefetch {len(commits)} commits: {e}")
+
     def checkout_before_pr(self, pr_info: PRInfo) -> str:
         """Checkout the commit just before the PR was merged."""
         if not self.repo:
@@ -106,17 +145,84 @@ class GitManager:
         except git.GitCommandError:
             return None
 
-    def get_pr_solution(self, pr_info: PRInfo) -> Solution:
-        """Extract the developer's solution from a PR."""
-        # Checkout after PR to get the final state
-        self.checkout_after_pr(pr_info)
+    def get_files_at_commit(self, commit: str, paths: list[str]) -> dict[str, str]:
+        """
+        Get the contents of several files at a commit without checking it out.
+
+        Blobs are read through GitPython's persistent ``git cat-file --batch`` process,
+        so no subprocess is started per file. In a partial clone, the blobs that aren't
+        local yet are fetched together first instead of one lazy fetch per file. Paths
+        that are missing at the commit, are not regular files or are not UTF-8 text are
+        left out.
+
+        Args:
+            commit: Commit SHA or other revision to read from.
+            paths: Repository-relative file paths.
+
+        Returns:
+            Mapping of path to file content.
+
+        """
+        if not self.repo:
+            raise ValueError("Repository not initialized. Call clone_or_update() first.")
+
+        tree = self.repo.commit(commit).tree
+        blobs = {}
+        for path in paths:
+            try:
+                blob = tree / path
+            except KeyError:
+                continue
+            if blob.type == "blob":
+                blobs[path] = blob
+
+        self._fetch_missing_blobs(commit, {blob.hexsha for blob in blobs.values()})
 
         files = {}
-        for file_change in pr_info.files_changed:
-            if file_change.status in ["added", "modified"]:
-                content = self.get_file_content(file_change.filename)
-                if content:
-                    files[file_change.filename] = content
+        for path, blob in blobs.items():
+            try:
+                files[path] = blob.data_stream.read().decode("utf-8")
+            except UnicodeDecodeError:
+                logger.debug(f"Skipping non-text file {path} at {commit[:8]}")
+        return files
+
+    def _fetch_missing_blobs(self, commit: str, blob_shas: set[str]) -> None:
+        """Fetch the blobs of a commit that a partial clone doesn't have in one request."""
+        if not self.repo or not blob_shas:
+            return
+
+        # Lists the commit's objects without fetching them, missing ones as "?<sha>"
+        objects = self.repo.git.rev_list("--objects", "--missing=print", "--no-walk", commit)
+        missing = [
+            line[1:]
+            for line in objects.splitlines()
+            if line.startswith("?") and line[1:] in blob_shas
+        ]
+        if not missing:
+            return
+
+        logger.debug(f"Fetching {len(missing)} blobs at {commit[:8]}")
+        try:
+            self.repo.git.fetch(
+                "origin", "--no-tags", "--no-write-fetch-head", "--filter=blob:none", *missing
+            )
+        except git.GitCommandError as e:
+            # Reading the blobs still fetches them, one at a time
+            logger.warning(f"Could not prefetch {len(missing)} blobs: {e}")
+
+    def get_pr_solution(self, pr_info: PRInfo) -> Solution:
+        """Extract the developer's solution from a PR."""
+        # Read the final state from the merge commit, leaving the working tree alone
+        paths = [
+            file_change.filename
+            for file_change in pr_info.files_changed
+            if file_change.status in ["added", "modified"]
+        ]
+        files = {
+            path: content
+            for path, content in self.get_files_at_commit(pr_info.merge_commit_sha, paths).items()
+            if content
+        }
 
         return Solution(
             files=files,
@@ -124,6 +230,53 @@ class GitManager:
             reasoning=f"Developer solution from PR #{pr_info.number}",
         )
 
+    def add_worktree(self, commit: str, name: str) -> GitManager:
+        """
+        Check out a commit into a separate worktree that shares this repository's objects.
+
+        Args:
+            commit: Commit to check out (detached).
+            name: Directory name for the worktree, unique among concurrent worktrees.
+
+        Returns:
+            A GitManager for the new worktree.
+
+        """
+        if not self.repo:
+            raise ValueError("Repository not initialized. Call clone_or_update() first.")
+
+        worktree_path = self.local_path.parent / f"{self.local_path.name}-worktrees" / name
+        # Drop a worktree left behind by an interrupted run
+        if worktree_path.exists():
+            self._remove_worktree_path(worktree_path)
+
+        logger.debug(f"Adding worktree {worktree_path} at {commit[:8]}")
+        self.repo.git.worktree("add", "--detach", str(worktree_path), commit)
+
+        worktree = GitManager(self.repo_url, local_path=worktree_path)
+        worktree.repo = git.Repo(worktree_path)
+        return worktree
+
+    def remove_worktree(self, worktree: GitManager) -> None:
+        """Remove a worktree created by add_worktree, including any changes in it."""
+        # Stop the persistent git processes GitPython keeps for the worktree's repo
+        if worktree.repo:
+            worktree.repo.close()
+            worktree.repo = None
+        self._remove_worktree_path(worktree.local_path)
+
+    def _remove_worktree_path(self, worktree_path: Path) -> None:
+        """Remove the worktree at a path, or the directory itself if it isn't registered."""
+        if not self.repo:
+            raise ValueError("Repository not initialized. Call clone_or_update() first.")
+
+        try:
+            self.repo.git.worktree("remove", "--force", str(worktree_path))
+        except git.GitCommandError:
+            # Not a registered worktree (anymore), remove the directory itself
+            shutil.rmtree(worktree_path, ignore_errors=True)
+            self.repo.git.worktree("prune")
+
     def clean(self, exclude_patterns: list[str] | None = None) -> None:
         """
         Remove untracked files and directories, excluding specified patterns.
@@ -2,12 +2,32 @@
 
 from __future__ import annotations
 
+import functools
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import TYPE_CHECKING
 
+import requests
+from requests.adapters import HTTPAdapter
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from auto_improvement.models import IssueInfo, IssueTrackerConfig
 
+# How long fetched issues are reused, in seconds; failed lookups are retried sooner
+ISSUE_CACHE_TTL = 600
+MISSING_ISSUE_CACHE_TTL = 30
+# Issues kept per client; the least recently used ones are dropped past this
+ISSUE_CACHE_MAXSIZE = 2048
+
+# Connections kept alive per host. Issues are looked up concurrently while GitHubClient
+# lists PRs (PR_FETCH_WORKERS) and while PRs left without one are enriched
+# (enrichment_workers).
+HTTP_POOL_SIZE = 32
+
 
 class AbstractIssueTrackerClient(ABC):
     """Base class for issue tracker clients."""
@@ -15,7 +35,10 @@ class AbstractIssueTrackerClient(ABC):
     @abstractmethod
     def __init__(self, config: IssueTrackerConfig) -> None:
         """Initialize the issue tracker client."""
-        ...
+        # Issues fetched by get_issue with their expiry time, see cache_issue_lookups
+        self._issue_cache: OrderedDict[str, tuple[float, IssueInfo | None]] = OrderedDict()
+        # PRs are enriched concurrently and share the cache
+        self._issue_cache_lock = threading.Lock()
 
     @abstractmethod
     def get_issue(self, issue_id: str) -> IssueInfo | None:
@@ -26,3 +49,41 @@ class AbstractIssueTrackerClient(ABC):
     def extract_issue_id_from_pr(self, pr_body: str) -> IssueInfo | None:
         """Extract issue ID from PR body and return issue info."""
         raise NotImplementedError
+
+
+def cache_issue_lookups[TrackerT: AbstractIssueTrackerClient](
+    get_issue: Callable[[TrackerT, str], IssueInfo | None],
+) -> Callable[[TrackerT, str], IssueInfo | None]:
+    """Reuse issues fetched by a client's get_issue, since several PRs often reference one."""
+
+    @functools.wraps(get_issue)
+    def wrapper(self: TrackerT, issue_id: str) -> IssueInfo | None:
+        now = time.monotonic()
+        with self._issue_cache_lock:
+            cached = self._issue_cache.get(issue_id)
+            if cached and now < cached[0]:
+                self._issue_cache.move_to_end(issue_id)
+                return cached[1]
+            if cached:
+                del self._issue_cache[issue_id]
+
+        # Fetched outside the lock so lookups of different issues still overlap
+        issue = get_issue(self, issue_id)
+        expires_at = now + (ISSUE_CACHE_TTL if issue else MISSING_ISSUE_CACHE_TTL)
+        with self._issue_cache_lock:
+            self._issue_cache[issue_id] = (expires_at, issue)
+            self._issue_cache.move_to_end(issue_id)
+            if len(self._issue_cache) > ISSUE_CACHE_MAXSIZE:
+                self._issue_cache.popitem(last=False)
+        return issue
+
+    return wrapper
+
+
+def create_http_session() -> requests.Session:
+    """Create a session that keeps a connection alive for each concurrent lookup."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
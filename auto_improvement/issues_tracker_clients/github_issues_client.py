@@ -7,10 +7,10 @@ import os
 import re
 import typing
 
-import requests
-
 from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
     AbstractIssueTrackerClient,
+    cache_issue_lookups,
+    create_http_session,
 )
 from auto_improvement.models import IssueInfo
 
@@ -19,26 +19,40 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Owner and repo in a GitHub URL
+GITHUB_REPO_PATTERN = re.compile(r"github\.com/([^/]+)/([^/]+)")
+
+# Common issue reference patterns, in order of preference
+ISSUE_REFERENCE_PATTERNS = [
+    re.compile(r"(?:fixes|closes|resolves|fix|close|resolve)\s+#(\d+)", re.IGNORECASE),
+    re.compile(
+        r"(?:fixes|closes|resolves|fix|close|resolve)\s+https?://github\.com/[^/]+/[^/]+/issues/(\d+)",
+        re.IGNORECASE,
+    ),
+]
+
 
 class GitHubIssuesClient(AbstractIssueTrackerClient):
     """Client for GitHub Issues."""
 
     def __init__(self, config: IssueTrackerConfig):
+        super().__init__(config)
         self.config = config
-        self.session = requests.Session()
+        self.session = create_http_session()
         github_token = os.getenv("GITHUB_TOKEN")
         if github_token:
             self.session.headers.update({"Authorization": f"token {github_token}"})
         self.session.headers.update({"Accept": "application/vnd.github.v3+json"})
 
     @typing.override
+    @cache_issue_lookups
     def get_issue(self, issue_id: str) -> IssueInfo | None:
         """Fetch issue from GitHub Issues."""
         # Parse repo from config URL
         # Expected format: https://github.com/owner/repo/issues
         if not self.config.url:
             return None
-        match = re.search(r"github\.com/([^/]+)/([^/]+)", self.config.url)
+        match = GITHUB_REPO_PATTERN.search(self.config.url)
         if not match:
             return None
 
@@ -46,7 +60,7 @@ class GitHubIssuesClient(AbstractIssueTrackerClient):
         url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_id}"
 
         try:
-            response = self.session.get(url)
+            response = self.session.get(url, timeout=30)
             response.raise_for_status()
             issue_data = response.json()
 
@@ -67,24 +81,10 @@ class GitHubIssuesClient(AbstractIssueTrackerClient):
         if not pr_body:
             return None
 
-        # Parse repo from config URL
-        if not self.config.url:
-            return None
-        match = re.search(r"github\.com/([^/]+)/([^/]+)", self.config.url)
-        if not match:
-            return None
-
-        owner, repo = match.groups()
-
         # Look for common issue reference patterns
-        patterns = [
-            r"(?:fixes|closes|resolves|fix|close|resolve)\s+#(\d+)",
-            r"(?:fixes|closes|resolves|fix|close|resolve)\s+https?://github\.com/[^/]+/[^/]+/issues/(\d+)",
-        ]
-
         issue_number = None
-        for pattern in patterns:
-            match = re.search(pattern, pr_body, re.IGNORECASE)
+        for pattern in ISSUE_REFERENCE_PATTERNS:
+            match = pattern.search(pr_body)
             if match:
                 issue_number = match.group(1)
                 break
@@ -92,19 +92,5 @@ class GitHubIssuesClient(AbstractIssueTrackerClient):
         if not issue_number:
             return None
 
-        # Fetch issue details
-        issue_url = f"https://api.github.com/repos/{owner}/{repo}/issues/{issue_number}"
-        try:
-            response = self.session.get(issue_url, timeout=30)
-            response.raise_for_status()
-            issue_data = response.json()
-
-            return IssueInfo(
-                id=str(issue_data["number"]),
-                title=issue_data["title"],
-                description=issue_data.get("body", ""),
-                url=issue_data["html_url"],
-                labels=[label["name"] for label in issue_data.get("labels", [])],
-            )
-        except Exception:
-            return None
+        # Fetch issue details using get_issue
+        return self.get_issue(issue_number)
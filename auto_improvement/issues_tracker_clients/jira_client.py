@@ -8,10 +8,10 @@ import re
 import typing
 from typing import TYPE_CHECKING
 
-import requests
-
 from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
     AbstractIssueTrackerClient,
+    cache_issue_lookups,
+    create_http_session,
 )
 from auto_improvement.models import IssueInfo
 
@@ -25,9 +25,10 @@ class JiraClient(AbstractIssueTrackerClient):
     """Client for Jira issue tracker."""
 
     def __init__(self, config: IssueTrackerConfig):
+        super().__init__(config)
         self.config = config
         self.base_url = config.url.rstrip("/") if config.url else ""
-        self.session = requests.Session()
+        self.session = create_http_session()
 
         # Set up authentication if provided
         if config.auth:
@@ -38,7 +39,24 @@ class JiraClient(AbstractIssueTrackerClient):
 
         self.session.headers.update({"Accept": "application/json"})
 
+        # Get ticket pattern from config or use default Jira pattern
+        ticket_pattern = config.ticket_pattern or r"[A-Z][A-Z0-9]+-\d+"
+
+        # Look for patterns like "PROJ-123" or Jira URLs, compiled once per client
+        patterns = [
+            rf"(?:fix|fixes|fixed|close|closes|closed|resolve|resolves|resolved)\s+({ticket_pattern})",
+            rf"({ticket_pattern})",  # Simple ticket reference
+        ]
+
+        # Also look for Jira URLs if base_url is configured
+        if self.base_url:
+            escaped_url = re.escape(self.base_url)
+            patterns.insert(0, rf"{escaped_url}/browse/({ticket_pattern})")
+
+        self.ticket_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
     @typing.override
+    @cache_issue_lookups
     def get_issue(self, issue_id: str) -> IssueInfo | None:
         """Fetch issue from Jira."""
         url = f"{self.base_url}/rest/api/2/issue/{issue_id}"
@@ -76,23 +94,9 @@ class JiraClient(AbstractIssueTrackerClient):
         if not pr_body:
             return None
 
-        # Get ticket pattern from config or use default Jira pattern
-        ticket_pattern = self.config.ticket_pattern or r"[A-Z][A-Z0-9]+-\d+"
-
-        # Look for patterns like "PROJ-123" or Jira URLs
-        patterns = [
-            rf"(?:fix|fixes|fixed|close|closes|closed|resolve|resolves|resolved)\s+({ticket_pattern})",
-            rf"({ticket_pattern})",  # Simple ticket reference
-        ]
-
-        # Also look for Jira URLs if base_url is configured
-        if self.base_url:
-            escaped_url = re.escape(self.base_url)
-            patterns.insert(0, rf"{escaped_url}/browse/({ticket_pattern})")
-
         issue_id = None
-        for pattern in patterns:
-            match = re.search(pattern, pr_body, re.IGNORECASE)
+        for pattern in self.ticket_patterns:
+            match = pattern.search(pr_body)
             if match:
                 issue_id = match.group(1).upper()
                 break
@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 import re
 import typing
 from typing import TYPE_CHECKING
 
-import requests
 from bs4 import BeautifulSoup, Tag
 
 from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
     AbstractIssueTrackerClient,
+    cache_issue_lookups,
+    create_http_session,
 )
 from auto_improvement.models import IssueInfo
 
@@ -20,16 +22,35 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Prefer lxml's C parser when it's installed, it's much faster on full ticket pages
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Ticket number prefix in a ticket title, e.g. "#12345: "
+TICKET_NUMBER_PREFIX = re.compile(r"^#?\d+:\s*")
+
+# Patterns like "Fixed #12345", "Refs #12345", "ticket #12345" or Trac URLs, in order of preference
+TICKET_REFERENCE_PATTERNS = [
+    re.compile(
+        r"(?:fix|fixes|fixed|close|closes|closed|resolve|resolves|resolved|ref|refs)\s+#(\d+)",
+        re.IGNORECASE,
+    ),
+    # Matches "ticket #12345", "ticket-12345", "ticket12345"
+    re.compile(r"ticket[\s-]+#?(\d+)", re.IGNORECASE),
+    re.compile(r"code\.djangoproject\.com/ticket/(\d+)", re.IGNORECASE),
+]
+
 
 class TracClient(AbstractIssueTrackerClient):
     """Client for Trac issue tracker (used by Django)."""
 
     def __init__(self, config: IssueTrackerConfig):
+        super().__init__(config)
         self.config = config
         self.base_url = config.url.rstrip("/") if config.url else ""
-        self.session = requests.Session()
+        self.session = create_http_session()
 
     @typing.override
+    @cache_issue_lookups
     def get_issue(self, issue_id: str) -> IssueInfo | None:
         """Fetch issue from Trac."""
         # Clean issue ID (remove # if present)
@@ -42,14 +63,14 @@ class TracClient(AbstractIssueTrackerClient):
             response.raise_for_status()
 
             # Parse HTML to extract issue information
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = BeautifulSoup(response.text, HTML_PARSER)
 
             # Get title
             title_elem = soup.find("h1", class_="searchable") or soup.find("h1")
             title = title_elem.get_text(strip=True) if title_elem else f"Ticket #{issue_id}"
 
             # Remove ticket number from title if present
-            title = re.sub(r"^#?\d+:\s*", "", title)
+            title = TICKET_NUMBER_PREFIX.sub("", title)
 
             # Get description - the actual text is in div.searchable inside div.description
             description_elem = soup.find("div", class_="description")
@@ -88,16 +109,9 @@ class TracClient(AbstractIssueTrackerClient):
             logger.debug("No PR body provided.")
             return None
 
-        # Look for patterns like "Fixed #12345", "Refs #12345", "ticket #12345" or Trac URLs
-        patterns = [
-            r"(?:fix|fixes|fixed|close|closes|closed|resolve|resolves|resolved|ref|refs)\s+#(\d+)",
-            r"ticket[\s-]+#?(\d+)",  # Matches "ticket #12345", "ticket-12345", "ticket12345"
-            r"code\.djangoproject\.com/ticket/(\d+)",
-        ]
-
         issue_id = None
-        for pattern in patterns:
-            match = re.search(pattern, pr_body, re.IGNORECASE)
+        for pattern in TICKET_REFERENCE_PATTERNS:
+            match = pattern.search(pr_body)
             if match:
                 issue_id = match.group(1)
                 break
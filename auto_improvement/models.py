@@ -89,10 +89,28 @@ class PRSelectionCriteria(BaseModel):
 class LearningConfig(BaseModel):
     """Learning configuration."""
 
-    max_attempts_per_pr: int = 3
+    max_attempts_per_pr: int = 3  # Kept for config compatibility; each PR gets one attempt
     success_threshold: float = 0.8
     min_prs_before_next: int = 1
     max_prs_per_session: int = 10
+    pr_cache_ttl_hours: float = Field(
+        default=24,
+        description="Reuse the cached merged PR listing for this long; 0 disables the cache",
+    )
+    research_cache_ttl_hours: float = Field(
+        default=7 * 24,
+        description="Reuse cached research output for this long; 0 disables the cache",
+    )
+    enrichment_workers: int = Field(
+        default=8,
+        ge=1,
+        description="Concurrent issue tracker lookups for listed PRs without a linked issue",
+    )
+    parallel_prs: int = Field(
+        default=1,
+        ge=1,
+        description="PRs whose solutions are generated at once, each in its own git worktree",
+    )
 
 
 class AgentConfig(BaseModel):
@@ -103,8 +121,21 @@ class AgentConfig(BaseModel):
     # For Code mode (CLI-based agents)
     code_path: str = Field(default="claude")
 
-    # Docker isolation (always enabled for security)
+    # Docker isolation (enabled by default for security)
+    use_docker: bool = Field(
+        default=True,
+        description="Run the agent in the Docker sandbox; disable only on an already confined host",
+    )
     docker_image: str = Field(default="auto-improve-sandbox", description="Docker image name")
+    reuse_container: bool = Field(
+        default=True,
+        description="Keep one sandbox container per workspace and run each agent call in it",
+    )
+    docker_network: str | None = Field(
+        default=None,
+        description="Docker network for the sandbox (e.g. 'host' to skip bridge setup); "
+        "None keeps Docker's default bridge",
+    )
 
     # For API mode
     model: str | None = None
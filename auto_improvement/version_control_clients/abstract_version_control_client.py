@@ -6,6 +6,8 @@ from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
         AbstractIssueTrackerClient,
     )
@@ -20,8 +22,13 @@ class AbstractVersionControlClient(ABC):
 
     @abstractmethod
     def get_merged_prs(
-        self, repo: str, criteria: PRSelectionCriteria, limit: int = 100
-    ) -> list[PRInfo]: ...
+        self,
+        repo: str,
+        criteria: PRSelectionCriteria,
+        limit: int = 100,
+        exclude: Collection[int] = (),
+    ) -> list[PRInfo]:
+        """Fetch up to ``limit`` merged PRs matching criteria, skipping numbers in ``exclude``."""
 
     @abstractmethod
     def get_pr(self, repo: str, pr_number: int) -> PRInfo: ...
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any, override
 
@@ -16,6 +17,8 @@ from auto_improvement.version_control_clients.abstract_version_control_client im
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Collection
+
     from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
         AbstractIssueTrackerClient,
     )
@@ -23,6 +26,62 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# PRs per GraphQL search page, each with its labels and files
+GRAPHQL_PAGE_SIZE = 50
+
+# PRs fetched or parsed at once, each looking up its linked issue, also the connection pool size
+PR_FETCH_WORKERS = 20
+
+# A page of a PR's changed files, with the cursor for the next one
+GRAPHQL_FILES_FRAGMENT = """
+fragment FileFields on PullRequestChangedFileConnection {
+  pageInfo { hasNextPage endCursor }
+  nodes { path additions deletions changeType }
+}
+"""
+
+# Fields needed to build a PRInfo from a single GraphQL response
+GRAPHQL_PR_FRAGMENT = (
+    """
+fragment PRFields on PullRequest {
+  number
+  title
+  body
+  url
+  mergedAt
+  baseRefOid
+  headRefOid
+  author { login }
+  mergeCommit { oid }
+  labels(first: 20) { nodes { name } }
+  files(first: 100) { ...FileFields }
+}
+"""
+    + GRAPHQL_FILES_FRAGMENT
+)
+
+# Remaining files of a PR that touches more than fit in a PRFields response
+GRAPHQL_FILES_QUERY = (
+    """
+query($owner: String!, $name: String!, $number: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) { files(first: 100, after: $after) { ...FileFields } }
+  }
+}
+"""
+    + GRAPHQL_FILES_FRAGMENT
+)
+
+# GraphQL file changeType -> REST file status
+GRAPHQL_FILE_STATUS = {
+    "ADDED": "added",
+    "DELETED": "removed",
+    "MODIFIED": "modified",
+    "RENAMED": "renamed",
+    "COPIED": "copied",
+    "CHANGED": "changed",
+}
+
 
 def _validate_repo_format(repo: str) -> tuple[str, str]:
     """Validate repo format and return owner and repo name."""
@@ -41,6 +100,7 @@ class GitHubClient(AbstractVersionControlClient):
     def __init__(self, issue_tracker: AbstractIssueTrackerClient):
         self.issue_tracker = issue_tracker
         token = os.getenv("GITHUB_TOKEN")
+        self.token = token
         self.base_url = "https://api.github.com"
         self.session = requests.Session()
 
@@ -49,9 +109,9 @@ class GitHubClient(AbstractVersionControlClient):
             total=5,  # Total number of retries
             backoff_factor=2,  # Wait 2, 4, 8, 16, 32 seconds between retries
             status_forcelist=[429, 500, 502, 503, 504],  # Retry on these HTTP status codes
-            allowed_methods=["GET"],  # Only retry GET requests
+            allowed_methods=["GET", "POST"],  # Only retry reads (GraphQL queries are POSTs)
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=PR_FETCH_WORKERS)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -61,18 +121,25 @@ class GitHubClient(AbstractVersionControlClient):
 
     @override
     def get_merged_prs(
-        self, repo: str, criteria: PRSelectionCriteria, limit: int = 100
+        self,
+        repo: str,
+        criteria: PRSelectionCriteria,
+        limit: int = 100,
+        exclude: Collection[int] = (),
     ) -> list[PRInfo]:
         """Fetch merged PRs matching criteria using GitHub Search API."""
-        # Use Search API to filter merged PRs directly (more efficient)
-        url = f"{self.base_url}/search/issues"
-
         since = datetime.now(UTC) - timedelta(days=criteria.days_back)
         since_str = since.strftime("%Y-%m-%d")
 
         # Build search query: merged PRs in repo, merged after date
         query = f"repo:{repo} is:pr is:merged merged:>={since_str}"
 
+        if self.token:
+            return self._search_merged_prs(repo, query, criteria, limit, exclude)
+
+        # Use Search API to filter merged PRs directly (more efficient)
+        url = f"{self.base_url}/search/issues"
+
         params: dict[str, str | int] = {
             "q": query,
             "sort": "updated",
@@ -98,35 +165,115 @@ class GitHubClient(AbstractVersionControlClient):
             if not items:
                 break
 
-            for item in items:
-                pr_number = item["number"]
-                logger.debug(f"Evaluating PR #{pr_number}")
+            # Skip PRs already processed by the caller, don't spend requests on them
+            pr_numbers = [item["number"] for item in items if item["number"] not in exclude]
+
+            # Fetch full PR details (search API returns limited data), at most as many
+            # as are still needed per batch so small limits don't fetch a whole page
+            while pr_numbers and len(all_prs) < limit:
+                batch_size = min(limit - len(all_prs), PR_FETCH_WORKERS)
+                batch, pr_numbers = pr_numbers[:batch_size], pr_numbers[batch_size:]
+
+                for pr_info in self._get_prs_rest(repo, batch):
+                    # Apply additional criteria
+                    if not self._matches_criteria(pr_info, criteria):
+                        logger.debug(f"PR #{pr_info.number} does not match criteria, skipping...")
+                        continue
+
+                    all_prs.append(pr_info)
+
+            page += 1
+
+        return all_prs
+
+    def _search_merged_prs(
+        self,
+        repo: str,
+        query: str,
+        criteria: PRSelectionCriteria,
+        limit: int,
+        exclude: Collection[int],
+    ) -> list[PRInfo]:
+        """Page through merged PRs with GraphQL search, which returns each PR's files inline."""
+        search_query = (
+            "query($q: String!, $first: Int!, $after: String) { "
+            "search(query: $q, type: ISSUE, first: $first, after: $after) { "
+            "pageInfo { hasNextPage endCursor } nodes { ...PRFields } } }"
+            f"{GRAPHQL_PR_FRAGMENT}"
+        )
+        all_prs: list[PRInfo] = []
+        page = 1
+        cursor: str | None = None
 
-                # Fetch full PR details (search API returns limited data)
-                try:
-                    pr_info = self.get_pr(repo, pr_number)
-                except requests.exceptions.RequestException as e:
-                    logger.warning(f"Failed to fetch PR #{pr_number}: {e}")
+        while len(all_prs) < limit:
+            logger.info(f"Fetching merged PRs page {page}...")
+            try:
+                data = self._graphql(
+                    search_query,
+                    {
+                        "q": f"{query} sort:updated-desc",
+                        "first": GRAPHQL_PAGE_SIZE,
+                        "after": cursor,
+                    },
+                )
+            except requests.exceptions.RequestException as e:
+                logger.error(f"Failed to fetch PRs page {page}: {e}")
+                break
+
+            search = data.get("search") or {}
+            prs_data: list[dict[str, Any]] = []
+            for pr_data in search.get("nodes") or []:
+                # Skip PRs already processed by the caller
+                if not pr_data or not pr_data.get("mergedAt") or pr_data["number"] in exclude:
                     continue
 
-                # Apply additional criteria
-                if not self._matches_criteria(pr_info, criteria):
-                    logger.debug(f"PR #{pr_number} does not match criteria, skipping...")
+                # More files on the first page than allowed rejects the PR anyway,
+                # so don't page through the rest of its files
+                if len(pr_data["files"]["nodes"]) > criteria.max_files_changed:
+                    logger.debug(f"PR #{pr_data['number']}: too many files changed, skipping...")
                     continue
 
-                all_prs.append(pr_info)
+                prs_data.append(pr_data)
+
+            # Parse at most as many PRs as are still needed per batch, so their linked
+            # issue lookups overlap without looking up issues for a whole page
+            while prs_data and len(all_prs) < limit:
+                batch_size = min(limit - len(all_prs), PR_FETCH_WORKERS)
+                batch, prs_data = prs_data[:batch_size], prs_data[batch_size:]
 
-                if len(all_prs) >= limit:
-                    break
+                for pr_info in self._parse_prs_graphql(repo, batch):
+                    if not self._matches_criteria(pr_info, criteria):
+                        logger.debug(f"PR #{pr_info.number} does not match criteria, skipping...")
+                        continue
 
+                    all_prs.append(pr_info)
+
+            page_info = search.get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                break
+            cursor = page_info["endCursor"]
             page += 1
 
         return all_prs
 
     @override
     def get_pr(self, repo: str, pr_number: int) -> PRInfo:
-        """Fetch a specific PR."""
+        """Fetch a specific PR, with its files in a single GraphQL request when a token is set."""
         owner, repo_name = _validate_repo_format(repo)
+
+        if self.token:
+            query = (
+                "query($owner: String!, $name: String!, $number: Int!) { "
+                "repository(owner: $owner, name: $name) { pullRequest(number: $number) { "
+                "...PRFields } } }"
+                f"{GRAPHQL_PR_FRAGMENT}"
+            )
+            data = self._graphql(query, {"owner": owner, "name": repo_name, "number": pr_number})
+            pr_data = (data.get("repository") or {}).get("pullRequest")
+            if not pr_data or not pr_data.get("mergedAt"):
+                raise ValueError(f"PR #{pr_number} not found or not merged in {repo}")
+            return self._parse_pr_graphql(repo, pr_data)
+
         url = f"{self.base_url}/repos/{owner}/{repo_name}/pulls/{pr_number}"
 
         response = self.session.get(url, timeout=30)
@@ -135,6 +282,133 @@ class GitHubClient(AbstractVersionControlClient):
 
         return self._parse_pr(pr_data)
 
+    def _get_prs_rest(self, repo: str, pr_numbers: list[int]) -> list[PRInfo]:
+        """
+        Fetch several PRs over REST at once, for clients without a token.
+
+        Each PR costs two round trips over REST, so the lookups overlap.
+        PRs that can't be fetched are left out.
+
+        Args:
+            repo: Repository in "owner/repo" format.
+            pr_numbers: PR numbers to fetch.
+
+        Returns:
+            Fetched PRs, in the order of pr_numbers.
+
+        """
+
+        def fetch_pr(pr_number: int) -> PRInfo | None:
+            try:
+                return self.get_pr(repo, pr_number)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Failed to fetch PR #{pr_number}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=PR_FETCH_WORKERS) as executor:
+            return [pr for pr in executor.map(fetch_pr, pr_numbers) if pr is not None]
+
+    def _graphql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Run a GraphQL query and return its data, logging errors for partial results."""
+        response = self.session.post(
+            f"{self.base_url}/graphql",
+            json={"query": query, "variables": variables},
+            timeout=30,
+        )
+        response.raise_for_status()
+        payload = response.json()
+
+        errors = [error.get("message") for error in payload.get("errors") or []]
+        data: dict[str, Any] | None = payload.get("data")
+        # A query that failed as a whole (bad token scope, rate limit, invalid query)
+        # has no data; report it like a failed request instead of an empty result
+        if not data and errors:
+            raise requests.exceptions.RequestException(
+                f"GraphQL query failed: {'; '.join(map(str, errors))}", response=response
+            )
+
+        # Missing PRs come back as errors next to the data for the others
+        for message in errors:
+            logger.debug(f"GraphQL error: {message}")
+        return data or {}
+
+    def _parse_prs_graphql(self, repo: str, prs_data: list[dict[str, Any]]) -> list[PRInfo]:
+        """Parse several PRs from GraphQL at once, since each one looks up its linked issue."""
+        with ThreadPoolExecutor(max_workers=PR_FETCH_WORKERS) as executor:
+            return list(
+                executor.map(lambda pr_data: self._parse_pr_graphql(repo, pr_data), prs_data)
+            )
+
+    def _parse_pr_graphql(self, repo: str, pr_data: dict[str, Any]) -> PRInfo:
+        """Parse PR data from a GraphQL PRFields fragment."""
+        from auto_improvement.models import FileChange, PRInfo
+
+        files = pr_data["files"]
+        files_data = list(files["nodes"])
+        if files["pageInfo"]["hasNextPage"]:
+            files_data += self._get_remaining_files(
+                repo, pr_data["number"], files["pageInfo"]["endCursor"]
+            )
+
+        # GraphQL has no per-file patch; nothing downstream reads it
+        file_changes = [
+            FileChange(
+                filename=file_data["path"],
+                status=GRAPHQL_FILE_STATUS.get(
+                    file_data["changeType"], file_data["changeType"].lower()
+                ),
+                additions=file_data["additions"],
+                deletions=file_data["deletions"],
+                changes=file_data["additions"] + file_data["deletions"],
+            )
+            for file_data in files_data
+        ]
+
+        pr_title = pr_data.get("title") or ""
+        pr_body = pr_data.get("body") or ""
+        linked_issue = self.issue_tracker.extract_issue_id_from_pr(f"{pr_title}\n{pr_body}")
+
+        # Deleted accounts come back as a null author
+        author = pr_data.get("author") or {"login": "ghost"}
+
+        return PRInfo(
+            number=pr_data["number"],
+            title=pr_title,
+            description=pr_body,
+            author=author["login"],
+            merged_at=datetime.fromisoformat(pr_data["mergedAt"]),
+            merge_commit_sha=pr_data["mergeCommit"]["oid"],
+            base_commit_sha=pr_data["baseRefOid"],
+            head_commit_sha=pr_data["headRefOid"],
+            files_changed=file_changes,
+            labels=[label["name"] for label in pr_data["labels"]["nodes"]],
+            linked_issue=linked_issue,
+            url=pr_data["url"],
+        )
+
+    def _get_remaining_files(self, repo: str, pr_number: int, cursor: str) -> list[dict[str, Any]]:
+        """Page through the files of a PR after the first page returned with its fields."""
+        owner, repo_name = _validate_repo_format(repo)
+        files_data: list[dict[str, Any]] = []
+        after: str | None = cursor
+
+        while after:
+            logger.debug(f"Fetching more files for PR #{pr_number}...")
+            data = self._graphql(
+                GRAPHQL_FILES_QUERY,
+                {"owner": owner, "name": repo_name, "number": pr_number, "after": after},
+            )
+            pr_data = (data.get("repository") or {}).get("pullRequest") or {}
+            files = pr_data.get("files")
+            if not files:
+                # The PR went missing between pages; keep the files fetched so far
+                logger.warning(f"Failed to fetch more files for PR #{pr_number}")
+                break
+            files_data += files["nodes"]
+            after = files["pageInfo"]["endCursor"] if files["pageInfo"]["hasNextPage"] else None
+
+        return files_data
+
     def _parse_pr(self, pr_data: dict[str, Any]) -> PRInfo:
         """Parse PR data from GitHub API."""
         from auto_improvement.models import FileChange, PRInfo
@@ -179,7 +453,7 @@ class GitHubClient(AbstractVersionControlClient):
             title=pr_data["title"],
             description=pr_data.get("body") or "",
             author=pr_data["user"]["login"],
-            merged_at=datetime.fromisoformat(pr_data["merged_at"].replace("Z", "+00:00")),
+            merged_at=datetime.fromisoformat(pr_data["merged_at"]),
             merge_commit_sha=pr_data["merge_commit_sha"],
             base_commit_sha=pr_data["base"]["sha"],
             head_commit_sha=pr_data["head"]["sha"],
@@ -234,14 +508,12 @@ class GitHubClient(AbstractVersionControlClient):
         url = f"{self.base_url}/repos/{owner}/{repo_name}/readme"
 
         try:
-            response = self.session.get(url, timeout=30)
+            # Ask for the raw file instead of base64 content inside a JSON wrapper
+            response = self.session.get(
+                url, headers={"Accept": "application/vnd.github.raw+json"}, timeout=30
+            )
             response.raise_for_status()
-            readme_data = response.json()
-
-            # Decode base64 content
-            import base64
-
-            content = base64.b64decode(readme_data["content"]).decode("utf-8")
-            return content
+            response.encoding = "utf-8"
+            return response.text
         except Exception:
             return None
@@ -12,6 +12,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from auto_improvement.agent_clients.claude_client import ClaudeClient
 from auto_improvement.models import (
     AgentConfig,
     Config,
@@ -47,6 +48,13 @@ def vcr_cassette_dir() -> str:
     return str(Path(__file__).parent / "cassettes")
 
 
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep Docker image state out of the real home and setups from leaking across tests."""
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setattr(ClaudeClient, "_ready_setups", set())
+
+
 # Sample PR data fixtures
 @pytest.fixture
 def sample_file_changes() -> list[FileChange]:
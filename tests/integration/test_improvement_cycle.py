@@ -7,8 +7,13 @@ calls for Claude Code CLI interactions.
 
 from __future__ import annotations
 
+import io
+import json
 import os
 import subprocess
+import sys
+import tarfile
+import threading
 from collections.abc import Generator
 from datetime import UTC, datetime
 from pathlib import Path
@@ -16,9 +21,16 @@ from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 import vcr  # type: ignore[import-untyped]
 
-from auto_improvement.agent_clients.claude_client import ClaudeClient
+from auto_improvement.agent_clients import claude_client as claude_client_module
+from auto_improvement.agent_clients.claude_client import (
+    DOCKERFILE_DIGEST,
+    SDK_RUNNER_SCRIPT,
+    ClaudeClient,
+)
+from auto_improvement.core import AutoImprovement
 from auto_improvement.issues_tracker_clients.github_issues_client import GitHubIssuesClient
 from auto_improvement.issues_tracker_clients.trac_client import TracClient
 from auto_improvement.models import (
@@ -108,6 +120,280 @@ class TestGitHubClientWithVCR:
         assert "Django" in readme or "django" in readme.lower()
 
 
+def _graphql_pr(number: int, **overrides: Any) -> dict[str, Any]:
+    """Build a GraphQL PRFields payload for a merged PR."""
+    return {
+        "number": number,
+        "title": f"Fixed #{number} -- Title",
+        "body": "Body",
+        "url": f"https://github.com/django/django/pull/{number}",
+        "mergedAt": "2024-01-15T10:30:00Z",
+        "baseRefOid": "base",
+        "headRefOid": "head",
+        "author": {"login": "dev"},
+        "mergeCommit": {"oid": "merge"},
+        "labels": {"nodes": [{"name": "bug"}]},
+        "files": {
+            "pageInfo": {"hasNextPage": False, "endCursor": None},
+            "nodes": [
+                {"path": "a.py", "additions": 3, "deletions": 1, "changeType": "MODIFIED"},
+                {"path": "b.py", "additions": 5, "deletions": 0, "changeType": "ADDED"},
+            ],
+        },
+        **overrides,
+    }
+
+
+class TestGitHubClientGraphQL:
+    """Test PR listing and lookups through the GitHub GraphQL API."""
+
+    @pytest.fixture
+    def github_client(self, monkeypatch: pytest.MonkeyPatch) -> GitHubClient:
+        """Create an authenticated GitHub client with a mock issue tracker."""
+        monkeypatch.setenv("GITHUB_TOKEN", "test-token")
+        issue_tracker = MagicMock()
+        issue_tracker.extract_issue_id_from_pr.return_value = None
+        return GitHubClient(issue_tracker)
+
+    def test_get_merged_prs_graphql_parses_prs(self, github_client: GitHubClient) -> None:
+        """Test that search results are parsed without any per-PR request."""
+        response = MagicMock()
+        response.json.return_value = {
+            "data": {
+                "search": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                    "nodes": [
+                        _graphql_pr(1),
+                        None,  # Not visible
+                        _graphql_pr(3, mergedAt=None, mergeCommit=None),  # Not merged
+                        _graphql_pr(4, author=None),
+                    ],
+                }
+            },
+        }
+        criteria = PRSelectionCriteria(has_linked_issue=False)
+
+        with (
+            patch.object(github_client.session, "post", return_value=response) as post,
+            patch.object(github_client.session, "get") as get,
+        ):
+            prs = github_client.get_merged_prs("django/django", criteria, limit=10)
+
+        assert post.call_count == 1
+        get.assert_not_called()
+
+        assert [pr.number for pr in prs] == [1, 4]
+        assert prs[0].files_changed[0].status == "modified"
+        assert prs[0].files_changed[1].status == "added"
+        assert prs[0].files_changed[0].changes == 4
+        assert prs[0].labels == ["bug"]
+        assert prs[0].merge_commit_sha == "merge"
+        assert prs[0].merged_at == datetime(2024, 1, 15, 10, 30, tzinfo=UTC)
+        assert prs[1].author == "ghost"
+
+    def test_get_merged_prs_graphql_search(self, github_client: GitHubClient) -> None:
+        """Test that merged PRs are listed with their files by paging through GraphQL search."""
+        pages = [
+            {
+                "search": {
+                    "pageInfo": {"hasNextPage": True, "endCursor": "cursor1"},
+                    "nodes": [_graphql_pr(1), _graphql_pr(2), _graphql_pr(3, labels={"nodes": []})],
+                }
+            },
+            {
+                "search": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": "cursor2"},
+                    "nodes": [_graphql_pr(4), _graphql_pr(5)],
+                }
+            },
+        ]
+        criteria = PRSelectionCriteria(has_linked_issue=False, include_labels=["bug"])
+
+        with (
+            patch.object(github_client, "_graphql", side_effect=pages) as graphql,
+            patch.object(github_client.session, "get") as get,
+        ):
+            prs = github_client.get_merged_prs("django/django", criteria, limit=2, exclude={1})
+
+        get.assert_not_called()
+        assert [pr.number for pr in prs] == [2, 4]
+        assert [call.args[1]["after"] for call in graphql.call_args_list] == [None, "cursor1"]
+        assert "repo:django/django is:pr is:merged" in graphql.call_args.args[1]["q"]
+
+    def test_get_merged_prs_graphql_skips_large_prs_before_paging(
+        self, github_client: GitHubClient
+    ) -> None:
+        """Test that a PR over max_files_changed on its first file page costs no more requests."""
+        large_pr = _graphql_pr(1)
+        large_pr["files"]["pageInfo"] = {"hasNextPage": True, "endCursor": "files1"}
+        small_pr = _graphql_pr(2)
+        small_pr["files"]["nodes"] = small_pr["files"]["nodes"][:1]
+        page = {
+            "search": {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [large_pr, small_pr],
+            }
+        }
+        criteria = PRSelectionCriteria(has_linked_issue=False, max_files_changed=1)
+
+        with patch.object(github_client, "_graphql", return_value=page) as graphql:
+            prs = github_client.get_merged_prs("django/django", criteria, limit=10)
+
+        assert graphql.call_count == 1
+        assert [pr.number for pr in prs] == [2]
+
+    def test_get_merged_prs_graphql_looks_up_issues_concurrently(
+        self, github_client: GitHubClient, sample_issue_info: IssueInfo
+    ) -> None:
+        """Test that the linked issues of a search page are looked up at the same time."""
+        response = MagicMock()
+        response.json.return_value = {
+            "data": {
+                "search": {
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                    "nodes": [_graphql_pr(1), _graphql_pr(2)],
+                }
+            },
+        }
+        # Each lookup waits for the other one, so serial lookups would time out
+        barrier = threading.Barrier(2, timeout=5)
+
+        def extract_issue_id_from_pr(text: str) -> IssueInfo:
+            barrier.wait()
+            return sample_issue_info
+
+        github_client.issue_tracker.extract_issue_id_from_pr.side_effect = extract_issue_id_from_pr
+
+        with patch.object(github_client.session, "post", return_value=response):
+            prs = github_client.get_merged_prs("django/django", PRSelectionCriteria(), limit=10)
+
+        assert [pr.number for pr in prs] == [1, 2]
+        assert all(pr.linked_issue == sample_issue_info for pr in prs)
+
+    def test_get_merged_prs_graphql_failure_logged(
+        self, github_client: GitHubClient, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that a GraphQL query that failed as a whole is reported, not read as no PRs."""
+        response = MagicMock()
+        response.json.return_value = {
+            "data": None,
+            "errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}],
+        }
+
+        with patch.object(github_client.session, "post", return_value=response):
+            prs = github_client.get_merged_prs("django/django", PRSelectionCriteria(), limit=10)
+            with pytest.raises(requests.exceptions.RequestException, match="rate limit"):
+                github_client.get_pr("django/django", 7)
+
+        assert prs == []
+        assert "GraphQL query failed: API rate limit exceeded" in caplog.text
+
+    def test_get_pr_single_request(self, github_client: GitHubClient) -> None:
+        """Test that a PR and its files are fetched with one GraphQL request."""
+        response = MagicMock()
+        response.json.return_value = {"data": {"repository": {"pullRequest": _graphql_pr(7)}}}
+
+        with (
+            patch.object(github_client.session, "post", return_value=response) as post,
+            patch.object(github_client.session, "get") as get,
+        ):
+            pr = github_client.get_pr("django/django", 7)
+            response.json.return_value = {"data": {"repository": {"pullRequest": None}}}
+            with pytest.raises(ValueError, match="PR #8 not found or not merged"):
+                github_client.get_pr("django/django", 8)
+
+        assert post.call_count == 2
+        get.assert_not_called()
+        assert pr.number == 7
+        assert [file.filename for file in pr.files_changed] == ["a.py", "b.py"]
+
+    def test_get_pr_pages_through_files(self, github_client: GitHubClient) -> None:
+        """Test that files past the first page are fetched instead of cut off."""
+        first_page = _graphql_pr(7)
+        first_page["files"]["pageInfo"] = {"hasNextPage": True, "endCursor": "files1"}
+        responses = [
+            {"repository": {"pullRequest": first_page}},
+            {
+                "repository": {
+                    "pullRequest": {
+                        "files": {
+                            "pageInfo": {"hasNextPage": False, "endCursor": "files2"},
+                            "nodes": [
+                                {
+                                    "path": "c.py",
+                                    "additions": 1,
+                                    "deletions": 1,
+                                    "changeType": "MODIFIED",
+                                },
+                            ],
+                        }
+                    }
+                }
+            },
+        ]
+
+        with patch.object(github_client, "_graphql", side_effect=responses) as graphql:
+            pr = github_client.get_pr("django/django", 7)
+
+        assert [file.filename for file in pr.files_changed] == ["a.py", "b.py", "c.py"]
+        assert graphql.call_args.args[1] == {
+            "owner": "django",
+            "name": "django",
+            "number": 7,
+            "after": "files1",
+        }
+
+    def test_get_pr_file_paging_stops_when_pr_missing(self, github_client: GitHubClient) -> None:
+        """Test that file paging stops instead of crashing when the next page has no PR."""
+        first_page = _graphql_pr(7)
+        first_page["files"]["pageInfo"] = {"hasNextPage": True, "endCursor": "files1"}
+        responses = [{"repository": {"pullRequest": first_page}}, {"repository": None}]
+
+        with patch.object(github_client, "_graphql", side_effect=responses):
+            pr = github_client.get_pr("django/django", 7)
+
+        assert [file.filename for file in pr.files_changed] == ["a.py", "b.py"]
+
+    def test_get_merged_prs_without_token_uses_rest(
+        self, github_client: GitHubClient, sample_pr_info: PRInfo
+    ) -> None:
+        """Test that an unauthenticated client searches over REST and looks up each PR."""
+        github_client.token = None
+        search_response = MagicMock()
+        search_response.json.return_value = {"items": [{"number": 1}, {"number": 2}]}
+        criteria = PRSelectionCriteria(has_linked_issue=False)
+
+        def get_pr(repo: str, pr_number: int) -> PRInfo:
+            return sample_pr_info.model_copy(update={"number": pr_number})
+
+        with (
+            patch.object(github_client.session, "get", return_value=search_response),
+            patch.object(github_client, "get_pr", side_effect=get_pr) as get_pr_mock,
+            patch.object(github_client.session, "post") as post,
+        ):
+            prs = github_client.get_merged_prs("django/django", criteria, limit=2)
+
+        assert [pr.number for pr in prs] == [1, 2]
+        assert get_pr_mock.call_count == 2
+        post.assert_not_called()
+
+    def test_get_prs_rest_keeps_order(
+        self, github_client: GitHubClient, sample_pr_info: PRInfo
+    ) -> None:
+        """Test that concurrent REST lookups keep PR order and leave out failed PRs."""
+        github_client.token = None
+
+        def get_pr(repo: str, pr_number: int) -> PRInfo:
+            if pr_number == 2:
+                raise requests.exceptions.HTTPError("404 Not Found")
+            return sample_pr_info.model_copy(update={"number": pr_number})
+
+        with patch.object(github_client, "get_pr", side_effect=get_pr):
+            prs = github_client._get_prs_rest("django/django", [3, 2, 1, 4])
+
+        assert [pr.number for pr in prs] == [3, 1, 4]
+
+
 class TestTracClientWithVCR:
     """Test Trac client using VCR cassettes."""
 
@@ -140,9 +426,11 @@ def _mock_subprocess_for_docker(
         raise ValueError("Empty command")
 
     if cmd[0] == "docker":
-        if "images" in cmd:
-            # Docker image check - return as if image exists
-            return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="abc123\n", stderr="")
+        if "inspect" in cmd:
+            # Docker image check - return as if a current image exists
+            return subprocess.CompletedProcess(
+                args=cmd, returncode=0, stdout=f"{DOCKERFILE_DIGEST}\n", stderr=""
+            )
         elif "run" in cmd:
             # Docker run - simulate successful execution
             return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
@@ -156,6 +444,15 @@ def _mock_subprocess_for_docker(
     return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
 
 
+def _mock_docker_build(returncode: int = 0, log: bytes = b"") -> MagicMock:
+    """Mock the docker build process started with subprocess.Popen."""
+    proc = MagicMock()
+    proc.__enter__.return_value = proc
+    proc.stderr = io.BytesIO(log)
+    proc.wait.return_value = returncode
+    return proc
+
+
 class TestClaudeClientMocked:
     """Test Claude client with mocked subprocess calls."""
 
@@ -168,20 +465,219 @@ class TestClaudeClientMocked:
             yield client
 
     def test_verify_claude_code(self, temp_repo_dir: Path) -> None:
-        """Test ClaudeClient initialization with Docker."""
+        """Test that Docker checks are deferred to the first SDK run and done once."""
         with patch("subprocess.run", side_effect=_mock_subprocess_for_docker) as mock_run:
             config = AgentConfig(code_path="claude")
-            ClaudeClient(config, working_dir=temp_repo_dir)
+            client = ClaudeClient(config, working_dir=temp_repo_dir)
 
-            # Verify subprocess was called for Docker image check
-            assert mock_run.call_count >= 1
-            # Verify docker images was called
+            # Construction no longer shells out to Docker
+            assert mock_run.call_count == 0
+
+            client.run_analysis("Analyze", temp_repo_dir)
+            client.run_analysis("Analyze again", temp_repo_dir)
+
+            # Verify the docker image was inspected only for the first run
             docker_calls = [
                 call
                 for call in mock_run.call_args_list
-                if "docker" in str(call) and "images" in str(call)
+                if "docker" in str(call) and "inspect" in str(call)
             ]
-            assert len(docker_calls) >= 1
+            assert len(docker_calls) == 1
+
+    def test_generate_solution_links_agent_md(
+        self,
+        claude_client: ClaudeClient,
+        sample_pr_info: PRInfo,
+        sample_issue_info: IssueInfo,
+        temp_repo_dir: Path,
+        tmp_path: Path,
+    ) -> None:
+        """Test that the agent file is linked into the workspace and edited in place."""
+        agent_md_path = tmp_path / "learning" / "CLAUDE.md"
+        agent_md_path.parent.mkdir()
+        agent_md_path.write_text("# Context\n")
+        workspace_agent_md = temp_repo_dir / "CLAUDE.md"
+
+        def edit_agent_md(*_args: Any, **_kwargs: Any) -> subprocess.CompletedProcess[bytes]:
+            assert workspace_agent_md.samefile(agent_md_path)
+            with workspace_agent_md.open("a") as f:
+                f.write("Learned something\n")
+            return subprocess.CompletedProcess(args=["docker", "run"], returncode=0)
+
+        with (
+            patch.object(claude_client, "_run_sdk_in_docker", side_effect=edit_agent_md),
+            patch.object(claude_client, "_detect_changed_files", return_value=[]),
+        ):
+            claude_client.generate_solution(sample_pr_info, sample_issue_info, agent_md_path)
+
+        assert not workspace_agent_md.exists()
+        assert agent_md_path.read_text() == "# Context\nLearned something\n"
+
+    def test_container_reused_across_runs(
+        self, temp_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that SDK runs in the same workspace share one sandbox container."""
+        monkeypatch.setattr(ClaudeClient, "_ready_setups", {("auto-improve-sandbox", "claude")})
+        with patch("subprocess.run", side_effect=_mock_subprocess_for_docker) as mock_run:
+            client = ClaudeClient(AgentConfig(code_path="claude"), working_dir=temp_repo_dir)
+            client.run_analysis("Analyze", temp_repo_dir)
+            client.run_analysis("Analyze again", temp_repo_dir)
+
+            commands = [call.args[0][:2] for call in mock_run.call_args_list]
+            assert commands == [["docker", "run"], ["docker", "exec"], ["docker", "exec"]]
+            assert "-d" in mock_run.call_args_list[0].args[0]
+
+            client._stop_containers()
+            assert mock_run.call_args_list[-1].args[0][:3] == ["docker", "rm", "-f"]
+
+    def test_docker_run_options_hardening(self, temp_repo_dir: Path) -> None:
+        """Test that sandbox containers drop capabilities and honor the network setting."""
+        client = ClaudeClient(AgentConfig(code_path="claude"), working_dir=temp_repo_dir)
+        with patch.object(ClaudeClient, "_get_claude_config_dir", return_value=temp_repo_dir):
+            options = client._build_docker_run_options(temp_repo_dir)
+            assert "--cap-drop=ALL" in options
+            assert "--security-opt=no-new-privileges" in options
+            assert not any(option.startswith("--network") for option in options)
+
+            client.config.docker_network = "host"
+            assert "--network=host" in client._build_docker_run_options(temp_repo_dir)
+
+    def test_run_without_docker(self, temp_repo_dir: Path) -> None:
+        """Test that disabling Docker runs the SDK runner on the host in the workspace."""
+        with patch("subprocess.run", side_effect=_mock_subprocess_for_docker) as mock_run:
+            client = ClaudeClient(
+                AgentConfig(code_path="claude", use_docker=False), working_dir=temp_repo_dir
+            )
+            client.run_analysis("Analyze", temp_repo_dir)
+
+        assert mock_run.call_count == 1
+        call = mock_run.call_args
+        assert call.args[0] == [sys.executable, "-c", SDK_RUNNER_SCRIPT]
+        assert call.kwargs["cwd"] == temp_repo_dir
+        assert json.loads(call.kwargs["input"])["cwd"] == str(temp_repo_dir)
+
+    def test_docker_image_state_marker(self, temp_repo_dir: Path) -> None:
+        """Test that a recorded image digest skips the Docker image check."""
+        config = AgentConfig(code_path="claude")
+        client = ClaudeClient(config, working_dir=temp_repo_dir)
+
+        with patch("subprocess.run", side_effect=_mock_subprocess_for_docker) as mock_run:
+            # Existing current image without a record is adopted and recorded
+            client._ensure_docker_image()
+            assert [call.args[0][:3] for call in mock_run.call_args_list] == [
+                ["docker", "image", "inspect"]
+            ]
+
+            # Recorded digest matches, no Docker call at all
+            mock_run.reset_mock()
+            ClaudeClient(config, working_dir=temp_repo_dir)._ensure_docker_image()
+            assert mock_run.call_count == 0
+
+            # Outdated digest triggers a rebuild
+            client._save_image_state("outdated")
+            with patch("subprocess.Popen", return_value=_mock_docker_build()) as mock_popen:
+                client._ensure_docker_image()
+            assert mock_run.call_count == 0
+
+        build_cmd = mock_popen.call_args.args[0]
+        assert build_cmd[:2] == ["docker", "build"]
+        assert "--cache-from" in build_cmd
+        assert f"auto-improve.dockerfile-digest={DOCKERFILE_DIGEST}" in build_cmd
+        assert mock_popen.call_args.kwargs["env"]["DOCKER_BUILDKIT"] == "1"
+
+        state = client._load_image_state()
+        assert state[config.docker_image] != "outdated"
+
+    @pytest.mark.parametrize(
+        "case",
+        [
+            (0, "", "Rebuilding outdated"),  # Built by hand or before images were labelled
+            (0, "old-digest", "Rebuilding outdated"),
+            (1, "", "Building"),  # No such image
+        ],
+    )
+    def test_docker_unrecorded_image_rebuilt_unless_current(
+        self,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+        case: tuple[int, str, str],
+    ) -> None:
+        """Test that an unrecorded image is only adopted when its digest label is current."""
+        returncode, label, message = case
+        client = ClaudeClient(AgentConfig(code_path="claude"), working_dir=tmp_path)
+        inspect = subprocess.CompletedProcess(args=[], returncode=returncode, stdout=label)
+
+        with (
+            patch("subprocess.run", return_value=inspect),
+            patch("subprocess.Popen", return_value=_mock_docker_build()) as mock_popen,
+        ):
+            client._ensure_docker_image()
+
+        assert mock_popen.call_count == 1
+        assert capsys.readouterr().out.startswith(message)
+        assert client._load_image_state()[client.config.docker_image] == DOCKERFILE_DIGEST
+
+    def test_docker_build_failure_reports_log_tail(
+        self, temp_repo_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a failed build reports only the end of the build log."""
+        monkeypatch.setattr(claude_client_module, "BUILD_LOG_TAIL_LINES", 2)
+        client = ClaudeClient(AgentConfig(code_path="claude"), working_dir=temp_repo_dir)
+        client._save_image_state("outdated")
+
+        build = _mock_docker_build(returncode=1, log=b"step 1\nstep 2\nerror: boom\n")
+        with (
+            patch("subprocess.Popen", return_value=build),
+            pytest.raises(RuntimeError, match="step 2\nerror: boom") as exc_info,
+        ):
+            client._ensure_docker_image()
+
+        assert "step 1" not in str(exc_info.value)
+        assert client._load_image_state()[client.config.docker_image] == "outdated"
+
+    def test_docker_image_rebuilt_after_removal(self, temp_repo_dir: Path) -> None:
+        """Test that a recorded image removed since, e.g. by docker rmi, is rebuilt."""
+        client = ClaudeClient(AgentConfig(code_path="claude"), working_dir=temp_repo_dir)
+        client._save_image_state(DOCKERFILE_DIGEST)
+        (client._get_claude_config_dir() / ".credentials.json").write_text("{}")
+        image_removed = True
+
+        def run(cmd: list[str], *args: Any, **kwargs: Any) -> subprocess.CompletedProcess[str]:
+            returncode = 0
+            if image_removed and cmd[:2] == ["docker", "run"]:
+                returncode = 125  # No such image
+            elif image_removed and cmd[:3] == ["docker", "image", "inspect"]:
+                returncode = 1
+            return subprocess.CompletedProcess(args=cmd, returncode=returncode, stdout="")
+
+        def build(*args: Any, **kwargs: Any) -> MagicMock:
+            nonlocal image_removed
+            image_removed = False
+            return _mock_docker_build()
+
+        with (
+            patch("subprocess.run", side_effect=run) as mock_run,
+            patch("subprocess.Popen", side_effect=build) as mock_popen,
+        ):
+            client.run_analysis("Analyze", temp_repo_dir)
+
+        assert mock_popen.call_count == 1
+        docker_runs = [call for call in mock_run.call_args_list if call.args[0][1] == "run"]
+        assert len(docker_runs) == 2
+        assert client._load_image_state()[client.config.docker_image] == DOCKERFILE_DIGEST
+
+    def test_docker_build_context(self, claude_client: ClaudeClient) -> None:
+        """Test that the build context ships the runner script next to the Dockerfile."""
+        context = claude_client._build_docker_context()
+
+        with tarfile.open(fileobj=io.BytesIO(context)) as tar:
+            assert tar.getnames() == ["Dockerfile", "sdk_runner.py"]
+            dockerfile = tar.extractfile("Dockerfile")
+            runner = tar.extractfile("sdk_runner.py")
+            assert dockerfile is not None
+            assert runner is not None
+            assert b"COPY --chown=claude:claude sdk_runner.py" in dockerfile.read()
+            assert runner.read().decode() == SDK_RUNNER_SCRIPT
 
     def test_generate_solution(
         self,
@@ -217,6 +713,23 @@ class TestClaudeClientMocked:
                 assert solution is not None
                 assert "query.py" in str(solution.files) or solution.description
 
+    def test_detect_changed_files(self, temp_repo_dir: Path) -> None:
+        """Test detecting modified, renamed and untracked files in the working directory."""
+        with patch("subprocess.run", side_effect=_mock_subprocess_for_docker):
+            client = ClaudeClient(AgentConfig(code_path="claude"), working_dir=temp_repo_dir)
+
+        (temp_repo_dir / "README.md").write_text("# Changed\n")
+        (temp_repo_dir / "new dir").mkdir()
+        (temp_repo_dir / "new dir" / "módulo.py").write_text("x = 1\n")
+        (temp_repo_dir / "old.txt").write_text("old\n")
+        subprocess.run(["git", "add", "old.txt"], cwd=temp_repo_dir, check=True)
+        subprocess.run(["git", "commit", "-qm", "add old"], cwd=temp_repo_dir, check=True)
+        subprocess.run(["git", "mv", "old.txt", "renamed.txt"], cwd=temp_repo_dir, check=True)
+
+        changed = client._detect_changed_files()
+
+        assert sorted(changed) == ["README.md", "new dir/módulo.py", "renamed.txt"]
+
 
 class TestFullIntegrationCycle:
     """Integration tests for the complete improvement cycle."""
@@ -511,3 +1024,306 @@ class TestEndToEndWithMocks:
                 # Verify SDK was called and solution was generated
                 assert mock_sdk.called
                 assert claude_solution is not None
+
+
+@pytest.fixture
+def auto_improve(temp_repo_dir: Path) -> AutoImprovement:
+    """Create an orchestrator whose repository and GitHub client are mocked."""
+    mock_git_manager = MagicMock()
+    mock_git_manager.local_path = temp_repo_dir
+    with patch("auto_improvement.core.GitManager", return_value=mock_git_manager):
+        auto_improve = AutoImprovement(repo_path="django/django")
+    auto_improve.github_client = MagicMock()
+    return auto_improve
+
+
+class TestResearchPhase:
+    """Tests for the orchestrator's research phase."""
+
+    def test_research_output_reused_after_reset(
+        self, auto_improve: AutoImprovement, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that research is cached outside the learning dir and restored after a reset."""
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        auto_improve.github_client.get_repo_info.return_value = {"name": "django"}
+        agent_md_path = auto_improve.analyzer.agent_md_path
+
+        def research(prompt: str, workspace_dir: Path) -> None:
+            agent_md_path.write_text("# Researched context\n")
+
+        with patch.object(
+            auto_improve.agent_client, "run_research", side_effect=research
+        ) as run_research:
+            auto_improve._research_phase()
+            agent_md_path.unlink()  # Reset learnings
+            auto_improve._research_phase()
+
+        assert run_research.call_count == 1
+        assert agent_md_path.read_text() == "# Researched context\n"
+
+    @pytest.mark.parametrize("case", ["expired", "disabled"])
+    def test_research_cache_not_reused(
+        self,
+        auto_improve: AutoImprovement,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        case: str,
+    ) -> None:
+        """Test that research runs again once the cache expires or when caching is disabled."""
+        monkeypatch.setenv("HOME", str(tmp_path / "home"))
+        cache_dir = tmp_path / "home" / ".auto-improve" / "research-cache"
+        auto_improve.github_client.get_repo_info.return_value = {"name": "django"}
+        if case == "disabled":
+            auto_improve.config.learning.research_cache_ttl_hours = 0
+        agent_md_path = auto_improve.analyzer.agent_md_path
+
+        def research(prompt: str, workspace_dir: Path) -> None:
+            agent_md_path.write_text("# Researched context\n")
+
+        with patch.object(
+            auto_improve.agent_client, "run_research", side_effect=research
+        ) as run_research:
+            auto_improve._research_phase()
+            if case == "expired":
+                # Age the cached output past the default TTL of a week
+                eight_days_ago = datetime.now(UTC).timestamp() - 8 * 24 * 3600
+                for cache_file in cache_dir.iterdir():
+                    os.utime(cache_file, (eight_days_ago, eight_days_ago))
+            agent_md_path.unlink()  # Reset learnings
+            auto_improve._research_phase()
+
+        assert run_research.call_count == 2
+        assert cache_dir.exists() == (case == "expired")
+
+    def test_repo_info_cached(self, auto_improve: AutoImprovement) -> None:
+        """Test that repo info is fetched once and reused from the learning dir."""
+        get_repo_info = auto_improve.github_client.get_repo_info
+        get_repo_info.return_value = {"name": "django", "language": "Python"}
+
+        assert auto_improve._fetch_repo_info() == {"name": "django", "language": "Python"}
+        assert auto_improve._fetch_repo_info() == {"name": "django", "language": "Python"}
+
+        # A new session in the same learning dir reads it from disk
+        with patch("auto_improvement.core.GitManager", return_value=auto_improve.git_manager):
+            next_session = AutoImprovement(repo_path="django/django")
+        next_session.github_client = auto_improve.github_client
+        assert next_session._fetch_repo_info() == {"name": "django", "language": "Python"}
+        assert get_repo_info.call_count == 1
+
+        # Failed fetches are not cached
+        auto_improve.repo_info_file.unlink()
+        next_session._repo_info = None
+        get_repo_info.side_effect = RuntimeError("rate limited")
+        assert next_session._fetch_repo_info() == {}
+        assert not auto_improve.repo_info_file.exists()
+
+    def test_steps_share_one_progress_display(self, auto_improve: AutoImprovement) -> None:
+        """Test that steps add tasks to the shared progress display and remove them when done."""
+        with auto_improve._progress_task("📦 Setting up repository..."):
+            assert len(auto_improve._progress.tasks) == 1
+        auto_improve._select_prs(5)
+
+        assert auto_improve._progress.tasks == []
+
+    def test_agent_prepared_before_progress_display(self, auto_improve: AutoImprovement) -> None:
+        """Test that interactive agent setup runs before the progress display starts."""
+
+        def prepare() -> None:
+            assert not auto_improve._progress.live.is_started
+
+        with (
+            patch.object(auto_improve.agent_client, "prepare", side_effect=prepare) as prepare_mock,
+            patch.object(AutoImprovement, "_setup_repository", side_effect=RuntimeError("stop")),
+            pytest.raises(RuntimeError, match="stop"),
+        ):
+            auto_improve.run_improvement_cycle()
+
+        prepare_mock.assert_called_once_with()
+
+
+class TestParallelPRs:
+    """Tests for processing several PRs at once in git worktrees."""
+
+    def test_prs_processed_in_worktrees(
+        self, auto_improve: AutoImprovement, sample_pr_info: PRInfo, tmp_path: Path
+    ) -> None:
+        """Test that each PR gets its own worktree and agent, and sessions keep PR order."""
+        auto_improve.config.learning.parallel_prs = 2
+        prs = [sample_pr_info.model_copy(update={"number": number}) for number in (1, 2, 3)]
+
+        def add_worktree(commit: str, name: str) -> MagicMock:
+            worktree = MagicMock()
+            worktree.local_path = tmp_path / name
+            worktree.get_pr_solution.return_value = Solution(files={}, description=name)
+            return worktree
+
+        git_manager = MagicMock()
+        git_manager.add_worktree.side_effect = add_worktree
+        auto_improve.git_manager = git_manager
+        auto_improve.analyzer._initialize_files()  # Done by _setup_repository in a run
+        agent_client = MagicMock()
+
+        with (
+            patch.object(
+                AutoImprovement, "_create_agent_client", return_value=agent_client
+            ) as create_agent_client,
+            patch.object(AutoImprovement, "_analyze_and_learn") as analyze_and_learn,
+        ):
+            sessions = list(auto_improve._process_prs(prs))
+
+        assert [session.pr_info.number for session in sessions] == [1, 2, 3]
+        assert [session.developer_solution.description for session in sessions] == [
+            "pr-1",
+            "pr-2",
+            "pr-3",
+        ]
+        assert all(session.success for session in sessions)
+        assert {call.args[0] for call in create_agent_client.call_args_list} == {
+            tmp_path / "pr-1",
+            tmp_path / "pr-2",
+            tmp_path / "pr-3",
+        }
+        assert analyze_and_learn.call_count == 3
+        assert agent_client.close.call_count == 3
+        assert git_manager.remove_worktree.call_count == 3
+        assert auto_improve._get_analyzed_prs() == {1, 2, 3}
+
+    def test_worktree_agent_gets_learnings_snapshot(
+        self, auto_improve: AutoImprovement, sample_pr_info: PRInfo, tmp_path: Path
+    ) -> None:
+        """Test that an agent in a worktree can't overwrite the shared learnings file."""
+        worktree = MagicMock()
+        worktree.local_path = tmp_path / "pr-1"
+        worktree.get_pr_solution.return_value = Solution(files={}, description="developer")
+        auto_improve.git_manager = MagicMock()
+        auto_improve.git_manager.add_worktree.return_value = worktree
+        auto_improve.analyzer._initialize_files()
+        agent_md_path = auto_improve.analyzer.agent_md_path
+        learnings = "# Learnings\n\n- Prefer small diffs\n"
+        agent_md_path.write_text(learnings)
+        snapshots = []
+
+        def generate_solution(pr_info: PRInfo, issue_info: object, agent_md_path: Path) -> Solution:
+            snapshots.append(agent_md_path)
+            assert agent_md_path.read_text() == learnings
+            agent_md_path.write_text("# Stale learnings")
+            return Solution(files={}, description="claude")
+
+        agent_client = MagicMock()
+        agent_client.agent_file = "CLAUDE.md"
+        agent_client.generate_solution.side_effect = generate_solution
+
+        with (
+            patch.object(AutoImprovement, "_create_agent_client", return_value=agent_client),
+            patch.object(AutoImprovement, "_analyze_and_learn"),
+        ):
+            session = auto_improve._process_pr_in_worktree(sample_pr_info)
+
+        assert session.success
+        assert snapshots == [tmp_path / "pr-1-CLAUDE.md"]
+        assert not snapshots[0].exists()
+        assert agent_md_path.read_text() == learnings
+
+
+class TestPRSelection:
+    """Tests for PR selection in the orchestrator with a mocked GitHub client."""
+
+    def test_pr_cache_reused_across_runs(
+        self, auto_improve: AutoImprovement, sample_pr_info: PRInfo
+    ) -> None:
+        """Test that a fresh PR listing is served from the cache instead of GitHub."""
+        get_merged_prs = auto_improve.github_client.get_merged_prs
+        get_merged_prs.return_value = [sample_pr_info]
+
+        assert auto_improve._get_merged_prs(20, {1}) == [sample_pr_info]
+        # The first listing was exhaustive, so it covers larger limits too
+        assert auto_improve._get_merged_prs(50, {1}) == [sample_pr_info]
+        # PRs analyzed since then are filtered out of the cached listing
+        assert auto_improve._get_merged_prs(20, {1, sample_pr_info.number}) == []
+        assert get_merged_prs.call_count == 1
+
+        # A PR excluded from the cached listing may be missing from it
+        auto_improve._get_merged_prs(20, set())
+        assert get_merged_prs.call_count == 2
+
+        # Different criteria invalidate the cache
+        auto_improve.config.pr_selection.days_back = 7
+        auto_improve._get_merged_prs(20, set())
+        assert get_merged_prs.call_count == 3
+
+        # A disabled cache always fetches
+        auto_improve.config.learning.pr_cache_ttl_hours = 0
+        auto_improve._get_merged_prs(20, set())
+        assert get_merged_prs.call_count == 4
+
+    def test_pr_cache_keeps_linked_issues(
+        self, auto_improve: AutoImprovement, sample_pr_info: PRInfo, sample_issue_info: IssueInfo
+    ) -> None:
+        """Test that linked issues found in the issue tracker are cached with the listing."""
+        pr = sample_pr_info.model_copy(update={"linked_issue": None})
+        auto_improve.github_client.get_merged_prs.return_value = [pr]
+        auto_improve.issue_tracker_client = MagicMock()
+        extract_issue = auto_improve.issue_tracker_client.extract_issue_id_from_pr
+        extract_issue.return_value = sample_issue_info
+
+        assert auto_improve._get_merged_prs(20, set()) == [pr]
+        cached_prs = auto_improve._get_merged_prs(20, set())
+
+        assert [cached_pr.linked_issue for cached_pr in cached_prs] == [sample_issue_info]
+        assert extract_issue.call_count == 1
+        assert auto_improve.github_client.get_merged_prs.call_count == 1
+
+    def test_search_prs_enriches_concurrently(
+        self,
+        auto_improve: AutoImprovement,
+        sample_pr_info: PRInfo,
+        sample_issue_info: IssueInfo,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that enrichment keeps PR order, fills linked issues and records skipped PRs."""
+        prs = [
+            sample_pr_info.model_copy(
+                update={"number": number, "description": f"Refs #{number}", "linked_issue": None}
+            )
+            for number in range(1, 9)
+        ]
+        auto_improve.github_client.get_merged_prs.return_value = prs
+        auto_improve.issue_tracker_client = MagicMock()
+        # Odd PRs reference an issue; lookups run concurrently, so key on the text
+        auto_improve.issue_tracker_client.extract_issue_id_from_pr.side_effect = lambda text: (
+            sample_issue_info if int(text.rsplit("#", 1)[1]) % 2 else None
+        )
+        auto_improve.config.learning.pr_cache_ttl_hours = 0
+
+        enriched = auto_improve.search_prs(limit=4, analyzed_prs={8})
+
+        assert [pr.number for pr in enriched] == [1, 3, 5, 7]
+        assert auto_improve.github_client.get_merged_prs.call_args.kwargs["exclude"] == {8}
+        assert all(pr.linked_issue == sample_issue_info for pr in enriched)
+        assert auto_improve._load_skipped_prs() == {2, 4, 6}
+        assert "Skipped 3 PRs without a linked issue" in capsys.readouterr().out
+
+    def test_analyzed_prs_appended_then_compacted(self, auto_improve: AutoImprovement) -> None:
+        """Test that analyzed PRs are appended to a log and folded into the tracking file."""
+        auto_improve.learning_dir.mkdir()
+        auto_improve.analyzed_prs_file.write_text(json.dumps({"analyzed_prs": [1]}))
+
+        auto_improve._save_analyzed_pr(2)
+        auto_improve._save_analyzed_pr(3)
+        assert auto_improve.analyzed_prs_log.read_text() == "2\n3\n"
+        assert json.loads(auto_improve.analyzed_prs_file.read_text())["analyzed_prs"] == [1]
+
+        # A session that died before compacting still has its PRs on the next load
+        assert auto_improve._load_analyzed_prs() == {1, 2, 3}
+
+        auto_improve._compact_analyzed_prs()
+        assert not auto_improve.analyzed_prs_log.exists()
+        assert json.loads(auto_improve.analyzed_prs_file.read_text())["analyzed_prs"] == [1, 2, 3]
+
+    def test_learning_dir_created_on_first_write(self, auto_improve: AutoImprovement) -> None:
+        """Test that the learning dir is only created once a tracking file is written."""
+        assert not auto_improve.learning_dir.exists()
+
+        auto_improve._save_skipped_pr(1)
+
+        assert auto_improve._load_skipped_prs() == {1}
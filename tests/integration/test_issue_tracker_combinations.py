@@ -27,6 +27,7 @@ import pytest
 import vcr  # type: ignore[import-untyped]
 from freezegun import freeze_time
 
+from auto_improvement.agent_clients.claude_client import DOCKERFILE_DIGEST
 from auto_improvement.issues_tracker_clients.github_issues_client import GitHubIssuesClient
 from auto_improvement.issues_tracker_clients.jira_client import JiraClient
 from auto_improvement.issues_tracker_clients.trac_client import TracClient
@@ -258,9 +259,11 @@ def _mock_subprocess_for_docker_sdk(
         raise ValueError("Empty command")
 
     if cmd[0] == "docker":
-        if "images" in cmd:
-            # Docker image check - return as if image exists
-            return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="abc123\n", stderr="")
+        if "inspect" in cmd:
+            # Docker image check - return as if a current image exists
+            return subprocess.CompletedProcess(
+                args=cmd, returncode=0, stdout=f"{DOCKERFILE_DIGEST}\n", stderr=""
+            )
         elif "run" in cmd:
             # Docker run - simulate successful execution
             return subprocess.CompletedProcess(args=cmd, returncode=0, stdout="", stderr="")
@@ -609,10 +612,10 @@ Django follows MTV (Model-Template-View) pattern.
                 raise ValueError("Empty command")
             # Mock docker commands for ClaudeClient initialization and SDK execution
             if cmd[0] == "docker":
-                if "images" in cmd:
-                    # Return as if docker image exists
+                if "inspect" in cmd:
+                    # Return as if a current docker image exists
                     return subprocess.CompletedProcess(
-                        args=cmd, returncode=0, stdout="abc123\n", stderr=""
+                        args=cmd, returncode=0, stdout=f"{DOCKERFILE_DIGEST}\n", stderr=""
                     )
                 elif "run" in cmd:
                     # Check if this is a run_research call by looking for config mount
@@ -0,0 +1,202 @@
+"""Unit tests for auto_improvement.analyzer module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from auto_improvement import analyzer as analyzer_module
+from auto_improvement.analyzer import ANALYSIS_PROMPT_FIELDS, UnifiedAnalyzer
+from auto_improvement.models import Solution
+
+
+@pytest.fixture
+def analyzer(tmp_path: Path) -> UnifiedAnalyzer:
+    """Create an analyzer with a mocked agent client."""
+    agent_client = MagicMock()
+    agent_client.agent_file = "CLAUDE.md"
+    agent_client.agent_name = "Claude"
+    return UnifiedAnalyzer(agent_client, tmp_path / "learning")
+
+
+def _write_skill(analyzer: UnifiedAnalyzer, name: str, content: str) -> None:
+    skill_dir = analyzer.skills_dir / name
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(content)
+
+
+class TestInitialization:
+    """Tests for learning directory setup."""
+
+    def test_init_does_not_touch_disk(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test that constructing the analyzer creates nothing until files are initialized."""
+        assert not analyzer.learning_dir.exists()
+
+        analyzer._initialize_files()
+
+        assert analyzer.skills_dir.is_dir()
+        assert analyzer.mcp_suggestions_path.exists()
+        assert analyzer.suggestions_path.exists()
+
+
+class TestSkillsSummary:
+    """Tests for the current skills summary."""
+
+    def test_no_skills(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test summary when no skills have been learned."""
+        assert analyzer._get_current_skills_summary() == "(No skills learned yet)"
+
+    def test_skill_preview_truncated(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test that each skill shows the start of its SKILL.md, marked if cut."""
+        _write_skill(analyzer, "caching", "é" * 2000)
+        _write_skill(analyzer, "exact", "x" * 500)
+        _write_skill(analyzer, "testing", "Short skill")
+
+        summary = analyzer._get_current_skills_summary()
+
+        assert f"### caching\n{'é' * 500}...\n" in summary
+        assert "�" not in summary
+        assert f"### exact\n{'x' * 500}\n" in summary
+        assert "### testing\nShort skill\n" in summary
+
+    def test_ignores_files_and_folders_without_skill(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test that only folders containing a SKILL.md are summarized, in name order."""
+        _write_skill(analyzer, "b-skill", "Second")
+        _write_skill(analyzer, "a-skill", "First")
+        (analyzer.skills_dir / "empty-skill").mkdir()
+        (analyzer.skills_dir / "notes.md").write_text("Not a skill")
+
+        summary = analyzer._get_current_skills_summary()
+
+        assert summary == "### a-skill\nFirst\n\n### b-skill\nSecond\n"
+
+    def test_summary_budget(
+        self, analyzer: UnifiedAnalyzer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that skills beyond the summary budget are left out."""
+        monkeypatch.setattr(analyzer_module, "SKILLS_SUMMARY_BUDGET", 800)
+        for name in ("a-skill", "b-skill", "c-skill"):
+            _write_skill(analyzer, name, "x" * 1000)
+
+        summary = analyzer._get_current_skills_summary()
+
+        assert "### a-skill" in summary
+        assert "### b-skill" not in summary
+        assert summary.endswith("(More skills in skills/ not shown)")
+
+
+class TestFormatSolution:
+    """Tests for formatting solutions into the prompt."""
+
+    def test_format_solution(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test the layout of a formatted solution."""
+        solution = Solution(
+            files={"a.py": "print('a')", "b.py": "print('b')"},
+            description="Fix",
+            reasoning="Because",
+        )
+
+        assert analyzer._format_solution(solution, "Developer") == (
+            "## Developer Solution\n\n"
+            "**Description:** Fix\n\n"
+            "**Reasoning:** Because\n\n\n"
+            "**Files Changed:**\n\n\n"
+            "### a.py\n```\nprint('a')\n```\n\n\n"
+            "### b.py\n```\nprint('b')\n```\n"
+        )
+
+
+class TestReadCached:
+    """Tests for cached learning file reads."""
+
+    def test_missing_file(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test that a missing learning file reads as None."""
+        assert analyzer._read_cached(analyzer.agent_md_path) is None
+
+    def test_reread_only_when_changed(
+        self, analyzer: UnifiedAnalyzer, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an unchanged file is served from cache and a changed one is re-read."""
+        analyzer.agent_md_path.parent.mkdir(parents=True, exist_ok=True)
+        analyzer.agent_md_path.write_text("# Context\n")
+        assert analyzer._read_cached(analyzer.agent_md_path) == "# Context\n"
+
+        with monkeypatch.context() as m:
+            m.setattr(Path, "read_text", MagicMock(side_effect=AssertionError("re-read")))
+            assert analyzer._read_cached(analyzer.agent_md_path) == "# Context\n"
+
+        analyzer.agent_md_path.write_text("# Context\nLearned more\n")
+        assert analyzer._read_cached(analyzer.agent_md_path) == "# Context\nLearned more\n"
+
+
+class TestAnalysisPrompt:
+    """Tests for analysis prompt parsing and rendering."""
+
+    def test_render_matches_str_format(self, analyzer: UnifiedAnalyzer) -> None:
+        """Test that the pre-parsed default prompt renders like str.format."""
+        values = {field: f"<{field}>" for field in ANALYSIS_PROMPT_FIELDS}
+
+        assert analyzer._render_prompt(**values) == analyzer.analysis_prompt.format(**values)
+
+    def test_custom_prompt_with_format_spec(self, tmp_path: Path) -> None:
+        """Test that conversions and format specs in custom prompts are honoured."""
+        agent_client = MagicMock()
+        analyzer = UnifiedAnalyzer(
+            agent_client, tmp_path, analysis_prompt="PR {pr_number:05d} by {agent_name!r} {{x}}"
+        )
+
+        assert analyzer._render_prompt(pr_number=42, agent_name="Claude") == (
+            "PR 00042 by 'Claude' {x}"
+        )
+
+    def test_unknown_placeholder_rejected(self, tmp_path: Path) -> None:
+        """Test that a custom prompt with an unknown placeholder fails at construction."""
+        with pytest.raises(ValueError, match="claude_solution"):
+            UnifiedAnalyzer(
+                MagicMock(),
+                tmp_path,
+                analysis_prompt="Compare {developer_solution} {claude_solution}",
+            )
+
+    def test_placeholder_with_attribute_or_index(self, tmp_path: Path) -> None:
+        """Test that placeholders are validated by their root name and rendered like str.format."""
+        analyzer = UnifiedAnalyzer(
+            MagicMock(), tmp_path, analysis_prompt="{pr_title[0]}{agent_name.__class__.__name__}"
+        )
+
+        assert analyzer._prompt_fields == {"pr_title", "agent_name"}
+        assert analyzer._render_prompt(pr_title="Fix", agent_name="Claude") == "Fstr"
+
+        with pytest.raises(ValueError, match="claude_solution"):
+            UnifiedAnalyzer(MagicMock(), tmp_path, analysis_prompt="{claude_solution.files}")
+
+    @pytest.mark.parametrize("prompt", ["Compare {} with {}", "Compare {0} with {1[x]}"])
+    def test_positional_placeholder_rejected(self, tmp_path: Path, prompt: str) -> None:
+        """Test that positional placeholders are rejected with a clear message."""
+        with pytest.raises(ValueError, match="Positional placeholder"):
+            UnifiedAnalyzer(MagicMock(), tmp_path, analysis_prompt=prompt)
+
+    def test_nested_format_spec_rejected(self, tmp_path: Path) -> None:
+        """Test that placeholders nested in a format spec are rejected with a clear message."""
+        with pytest.raises(ValueError, match=r"Nested placeholder .*\{pr_number:\{agent_name\}\}"):
+            UnifiedAnalyzer(MagicMock(), tmp_path, analysis_prompt="PR {pr_number:{agent_name}}")
+
+    def test_unreferenced_learning_files_not_read(self, tmp_path: Path) -> None:
+        """Test that learning state the custom prompt doesn't use is never read."""
+        agent_client = MagicMock()
+        analyzer = UnifiedAnalyzer(
+            agent_client, tmp_path, analysis_prompt="Compare {developer_solution} {agent_solution}"
+        )
+        solution = Solution(files={}, description="Fix")
+
+        with (
+            patch.object(analyzer, "_read_cached") as read_cached,
+            patch.object(analyzer, "_get_current_skills_summary") as skills_summary,
+        ):
+            analyzer.analyze_and_learn(solution, solution, MagicMock(number=1))
+
+        read_cached.assert_not_called()
+        skills_summary.assert_not_called()
+        agent_client.run_analysis.assert_called_once()
@@ -3,10 +3,11 @@
 from __future__ import annotations
 
 from pathlib import Path
+from unittest.mock import patch
 
 import yaml
 
-from auto_improvement.config import save_config
+from auto_improvement.config import _ConfigDumper, save_config
 from auto_improvement.issues_tracker_clients.trac_client import TracClient
 from auto_improvement.models import (
     Config,
@@ -73,6 +74,23 @@ class TestLoadConfig:
         assert config.issue_tracker.client == TracClient
         assert config.issue_tracker.url == "https://code.djangoproject.com"
 
+    def test_load_reuses_parse_until_file_changes(self, tmp_path: Path) -> None:
+        """Test that an unchanged file is parsed once and every caller gets its own copy."""
+        from auto_improvement.core import load_config as core_load_config
+
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("project:\n  name: Cached\n")
+
+        with patch("yaml.load", wraps=yaml.load) as yaml_load:
+            first = core_load_config(config_file)
+            first.project.name = "Changed by caller"
+            second = core_load_config(config_file)
+            assert yaml_load.call_count == 1
+        assert second.project.name == "Cached"
+
+        config_file.write_text("project:\n  name: Edited on disk\n")
+        assert core_load_config(config_file).project.name == "Edited on disk"
+
 
 class TestSaveConfig:
     """Tests for save_config function."""
@@ -133,3 +151,12 @@ class TestSaveConfig:
         assert "issue_tracker" in data
         # The client should be serialized as a string path or similar
         assert data["issue_tracker"]["url"] == "https://trac.example.com"
+
+    def test_config_dumper_writes_types_as_import_paths(self) -> None:
+        """Test that class objects are dumped as their import path string."""
+        text = yaml.dump({"client": TracClient, "alias": list[int]}, Dumper=_ConfigDumper)
+
+        assert yaml.safe_load(text) == {
+            "client": "auto_improvement.issues_tracker_clients.trac_client.TracClient",
+            "alias": "builtins.list",
+        }
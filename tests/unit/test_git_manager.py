@@ -5,11 +5,13 @@ from __future__ import annotations
 import subprocess
 from datetime import UTC, datetime
 from pathlib import Path
+from unittest.mock import patch
 
+import git
 import pytest
 
-from auto_improvement.git_manager import GitManager
-from auto_improvement.models import PRInfo
+from auto_improvement.git_manager import CLONE_OPTIONS, GitManager
+from auto_improvement.models import FileChange, PRInfo
 
 
 class TestGitManagerInit:
@@ -121,6 +123,132 @@ class TestGitManagerOperations:
 
         assert not (repo_path / "untracked.txt").exists()
 
+    def test_get_pr_solution_reads_merge_commit(self, temp_repo: tuple[GitManager, Path]) -> None:
+        """Test that the developer solution comes from the merge commit, not the working tree."""
+        manager, repo_path = temp_repo
+        assert manager.repo is not None
+        (repo_path / "src").mkdir()
+        (repo_path / "src" / "app.py").write_text("print('merged')\n")
+        (repo_path / "empty.py").write_text("")
+        manager.repo.git.add(A=True)
+        merge_commit = manager.repo.index.commit("Merge PR").hexsha
+
+        # Working tree changes and deleted files must not leak into the solution
+        (repo_path / "src" / "app.py").write_text("print('agent attempt')\n")
+        file_changes = [
+            FileChange(filename=name, status=status, additions=1, deletions=0, changes=1)
+            for name, status in [
+                ("src/app.py", "added"),
+                ("empty.py", "added"),
+                ("README.md", "modified"),
+                ("gone.py", "removed"),
+                ("missing.py", "modified"),
+            ]
+        ]
+        pr_info = PRInfo(
+            number=1,
+            title="Test",
+            description="Test",
+            author="user",
+            merged_at=datetime.now(UTC),
+            merge_commit_sha=merge_commit,
+            base_commit_sha=merge_commit,
+            head_commit_sha=merge_commit,
+            files_changed=file_changes,
+            url="https://github.com/test/repo/pull/1",
+        )
+
+        solution = manager.get_pr_solution(pr_info)
+
+        assert solution.files == {
+            "src/app.py": "print('merged')\n",
+            "README.md": "# Test Repository\n",
+        }
+        assert (repo_path / "src" / "app.py").read_text() == "print('agent attempt')\n"
+
+    def test_get_files_at_commit_fetches_missing_blobs_at_once(
+        self, temp_repo: tuple[GitManager, Path], tmp_path: Path
+    ) -> None:
+        """Test that a partial clone fetches the blobs it lacks in one request."""
+        manager, repo_path = temp_repo
+        assert manager.repo is not None
+        (repo_path / "a.py").write_text("a = 1\n")
+        (repo_path / "b.py").write_text("b = 2\n")
+        manager.repo.git.add(A=True)
+        commit = manager.repo.index.commit("Add files").hexsha
+        manager.repo.git.config("uploadpack.allowFilter", "true")
+        manager.repo.git.config("uploadpack.allowAnySHA1InWant", "true")
+
+        clone = GitManager("test/repo", local_path=tmp_path / "clone")
+        clone.repo = git.Repo.clone_from(
+            f"file://{repo_path}", clone.local_path, multi_options=CLONE_OPTIONS
+        )
+
+        blob_shas = clone.repo.git.rev_parse(f"{commit}:a.py", f"{commit}:b.py").split()
+
+        with patch.object(clone.repo, "git", wraps=clone.repo.git) as repo_git:
+            files = clone.get_files_at_commit(commit, ["a.py", "b.py", "missing.py"])
+            assert clone.get_files_at_commit(commit, ["a.py"]) == {"a.py": "a = 1\n"}
+
+        assert files == {"a.py": "a = 1\n", "b.py": "b = 2\n"}
+        # The second read finds the blob already fetched
+        repo_git.fetch.assert_called_once()
+        assert sorted(repo_git.fetch.call_args.args[-2:]) == sorted(blob_shas)
+
+    def test_worktree_checks_out_commit_separately(
+        self, temp_repo: tuple[GitManager, Path]
+    ) -> None:
+        """Test that a worktree has its own checkout and is removed with its changes."""
+        manager, repo_path = temp_repo
+        assert manager.repo is not None
+        base_commit = manager.repo.head.commit.hexsha
+        (repo_path / "README.md").write_text("# Changed\n")
+        manager.repo.git.commit("-am", "Change README")
+
+        worktree = manager.add_worktree(base_commit, "pr-1")
+        assert (worktree.local_path / "README.md").read_text() == "# Test Repository\n"
+        assert (repo_path / "README.md").read_text() == "# Changed\n"
+
+        (worktree.local_path / "agent.py").write_text("# Agent attempt\n")
+        worktree_repo = worktree.repo
+        assert worktree_repo is not None
+        with patch.object(worktree_repo, "close", wraps=worktree_repo.close) as close:
+            manager.remove_worktree(worktree)
+        close.assert_called_once()
+        assert worktree.repo is None
+        assert not worktree.local_path.exists()
+
+        # The same name can be reused, e.g. after an interrupted run
+        worktree = manager.add_worktree(base_commit, "pr-1")
+        worktree.local_path.joinpath(".git").unlink()
+        assert manager.add_worktree(base_commit, "pr-1").local_path == worktree.local_path
+
+    def test_prefetch_commits_single_fetch(self, temp_repo: tuple[GitManager, Path]) -> None:
+        """Test that missing commits are prefetched with one deduplicated fetch."""
+        manager, _ = temp_repo
+        assert manager.repo is not None
+        present = manager.repo.head.commit.hexsha
+        base, merge = "1" * 40, "2" * 40
+
+        # The fixture repo has no origin; the fetch error is logged, not raised
+        with patch.object(manager.repo, "git", wraps=manager.repo.git) as repo_git:
+            manager.prefetch_commits([base, present, merge, base])
+            manager.prefetch_commits([present])
+            manager.prefetch_commits([])
+        repo_git.fetch.assert_called_once_with("origin", base, merge)
+
+    def test_clone_is_partial(self, tmp_path: Path) -> None:
+        """Test that a fresh clone skips blobs, tags and the initial checkout."""
+        manager = GitManager("owner/repo", local_path=tmp_path / "repo")
+
+        with patch("git.Repo.clone_from") as clone_from:
+            manager.clone_or_update()
+
+        args, kwargs = clone_from.call_args
+        assert args == ("https://github.com/owner/repo.git", tmp_path / "repo")
+        assert kwargs["multi_options"] == ["--filter=blob:none", "--no-tags", "--no-checkout"]
+        assert kwargs["env"]["GIT_TERMINAL_PROMPT"] == "0"
+
 
 class TestGitManagerErrorHandling:
     """Tests for GitManager error handling."""
@@ -7,6 +7,11 @@ from unittest.mock import MagicMock, patch
 import pytest
 import requests
 
+from auto_improvement.issues_tracker_clients.abstract_issue_tracker import (
+    HTTP_POOL_SIZE,
+    ISSUE_CACHE_MAXSIZE,
+    MISSING_ISSUE_CACHE_TTL,
+)
 from auto_improvement.issues_tracker_clients.github_issues_client import GitHubIssuesClient
 from auto_improvement.issues_tracker_clients.jira_client import JiraClient
 from auto_improvement.issues_tracker_clients.trac_client import TracClient
@@ -28,6 +33,11 @@ class TestGitHubIssuesClient:
         """Test client initialization."""
         assert client.config.url == "https://github.com/django/django/issues"
 
+    def test_session_pool_sized_for_concurrent_lookups(self, client: GitHubIssuesClient) -> None:
+        """Test that the session keeps enough connections alive for concurrent enrichment."""
+        adapter = client.session.get_adapter("https://api.github.com")
+        assert adapter._pool_maxsize == HTTP_POOL_SIZE  # type: ignore[attr-defined]
+
     def test_extract_issue_id_from_pr_fixes_pattern(self, client: GitHubIssuesClient) -> None:
         """Test extracting issue ID from PR body with 'fixes' pattern."""
         with patch.object(client.session, "get") as mock_get:
@@ -110,6 +120,63 @@ class TestGitHubIssuesClient:
             result = client.get_issue("123")
             assert result is None
 
+    def test_get_issue_cached(self, client: GitHubIssuesClient) -> None:
+        """Test that issues referenced by several PRs are fetched once."""
+        with patch.object(client.session, "get") as mock_get:
+            mock_response = MagicMock()
+            mock_response.json.return_value = {
+                "number": 123,
+                "title": "Test Issue",
+                "body": "Issue description",
+                "html_url": "https://github.com/django/django/issues/123",
+                "labels": [],
+            }
+            mock_get.return_value = mock_response
+
+            first = client.extract_issue_id_from_pr("Fixes #123")
+            second = client.extract_issue_id_from_pr("Closes #123 as well")
+
+        assert first is not None
+        assert second == first
+        assert mock_get.call_count == 1
+
+    def test_get_issue_failure_retried_after_ttl(self, client: GitHubIssuesClient) -> None:
+        """Test that failed lookups are cached briefly, then retried."""
+        with (
+            patch.object(client.session, "get") as mock_get,
+            patch("auto_improvement.issues_tracker_clients.abstract_issue_tracker.time") as clock,
+        ):
+            mock_get.side_effect = requests.exceptions.RequestException("API Error")
+            clock.monotonic.return_value = 0.0
+            assert client.get_issue("123") is None
+            assert client.get_issue("123") is None
+            assert mock_get.call_count == 1
+
+            clock.monotonic.return_value = MISSING_ISSUE_CACHE_TTL + 1
+            assert client.get_issue("123") is None
+            assert mock_get.call_count == 2
+
+    def test_issue_cache_bounded(self, client: GitHubIssuesClient) -> None:
+        """Test that the cache drops least recently used and expired issues."""
+        with (
+            patch.object(client.session, "get") as mock_get,
+            patch("auto_improvement.issues_tracker_clients.abstract_issue_tracker.time") as clock,
+        ):
+            mock_get.side_effect = requests.exceptions.RequestException("API Error")
+            clock.monotonic.return_value = 0.0
+            for issue_number in range(ISSUE_CACHE_MAXSIZE):
+                client.get_issue(str(issue_number))
+            client.get_issue("0")  # Recently used, so kept
+            client.get_issue("new")
+
+            assert len(client._issue_cache) == ISSUE_CACHE_MAXSIZE
+            assert "0" in client._issue_cache
+            assert "1" not in client._issue_cache
+
+            clock.monotonic.return_value = MISSING_ISSUE_CACHE_TTL + 1
+            client.get_issue("0")
+            assert client._issue_cache["0"][0] == 2 * MISSING_ISSUE_CACHE_TTL + 1
+
 
 class TestTracClient:
     """Tests for TracClient."""